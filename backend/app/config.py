@@ -1,4 +1,5 @@
 import pandas as pd
+import pyarrow.parquet as pq
 import os
 from typing import Tuple, List
 import logging
@@ -10,7 +11,8 @@ class YearConfig:
     def __init__(
             self, 
             predictions_data_path: str = "backend/data/Predictions.parquet",
-            alerts_data_path: str = "backend/data/Alerts.parquet"
+            alerts_data_path: str = "backend/data/Alerts.parquet",
+            df: pd.DataFrame | None = None
         ):
         self.predictions_data_path = predictions_data_path
         self.alerts_data_path = alerts_data_path
@@ -19,19 +21,16 @@ class YearConfig:
         self._year_range = []
         self._min_year = None
         self._max_year = None
-        self._initialize_config()
+        self._initialize_config(df)
 
-    def _initialize_config(self):
+    def _initialize_config(self, df: pd.DataFrame | None = None):
         try:
-            if not os.path.exists(self.predictions_data_path):
+            if df is not None:
+                years = self._years_from_frame(df)
+            elif not os.path.exists(self.predictions_data_path):
                 return
-            
-            df = pd.read_parquet(self.predictions_data_path)
-
-            if df.empty or "SCHOOL_YEAR" not in df.columns:
-                return
-            
-            years = sorted(int(y) for y in df["SCHOOL_YEAR"].dropna().unique())
+            else:
+                years = self._years_from_metadata()
 
             if not years:
                 return
@@ -44,6 +43,44 @@ class YearConfig:
         except Exception as e:
             logger.info(f'Error Reading values: {e}')
 
+    @staticmethod
+    def _years_from_frame(df: pd.DataFrame) -> List[int]:
+        if df.empty or "SCHOOL_YEAR" not in df.columns:
+            return []
+        return sorted(int(y) for y in df["SCHOOL_YEAR"].dropna().unique())
+
+    def _years_from_metadata(self) -> List[int]:
+        """Min/max SCHOOL_YEAR from row-group statistics, without decoding any data pages.
+
+        Falls back to reading just the SCHOOL_YEAR column when a row group was
+        written without statistics.
+        """
+        parquet_file = pq.ParquetFile(self.predictions_data_path)
+        if "SCHOOL_YEAR" not in parquet_file.schema_arrow.names:
+            return []
+
+        metadata = parquet_file.metadata
+        lows, highs = [], []
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            column = next(
+                (row_group.column(j) for j in range(row_group.num_columns)
+                 if row_group.column(j).path_in_schema == "SCHOOL_YEAR"),
+                None
+            )
+            stats = column.statistics if column is not None else None
+            if stats is not None and stats.null_count == row_group.num_rows:
+                continue
+            if stats is None or not stats.has_min_max:
+                df = pd.read_parquet(self.predictions_data_path, columns=["SCHOOL_YEAR"])
+                return self._years_from_frame(df)
+            lows.append(int(stats.min))
+            highs.append(int(stats.max))
+
+        if not lows:
+            return []
+        return [min(lows), max(highs)]
+
     
     
     @property
@@ -81,9 +118,13 @@ class YearConfig:
     def is_predicted_year(self, year: int) -> bool:
         return year == self._predicted_year
     
-    def refresh_config(self):
+    def refresh_config(self, df: pd.DataFrame | None = None):
         logger.info("Refreshing year configuration...")
-        self._initialize_config()
+        self._initialize_config(df)
+
+    def adopt(self, other: 'YearConfig'):
+        """Take on the years of ``other`` in one step, as a store publish does."""
+        self.__dict__ = dict(other.__dict__)
     
     def get_config_summary(self) -> dict:
         return {
@@ -111,8 +152,8 @@ def get_year_range() -> List[int]:
 def get_historical_years() -> List[int]:
     return year_config.get_historical_years()
 
-def refresh_year_config():
-    year_config.refresh_config()
+def refresh_year_config(df: pd.DataFrame | None = None):
+    year_config.refresh_config(df)
 
 def get_alerts_data_path():
     return year_config.alerts_data_path
@@ -120,6 +161,28 @@ def get_alerts_data_path():
 def get_predictions_data_path():
     return year_config.predictions_data_path
 
+def get_reload_interval() -> float:
+    return float(os.getenv('DATA_RELOAD_INTERVAL', '0'))
+
+def get_snapshot_dir() -> str:
+    return os.getenv('DATA_SNAPSHOT_DIR', 'data_snapshot')
+
+def get_result_cache_mb() -> float:
+    return float(os.getenv('RESULT_CACHE_MB', '64'))
+
+def get_summary_report_cache_mb() -> float:
+    return float(os.getenv('SUMMARY_REPORT_CACHE_MB', '16'))
+
+def get_bulkhead_limits(name: str, workers: int, queue: int) -> Tuple[int, int]:
+    prefix = f'BULKHEAD_{name.upper()}'
+    return int(os.getenv(f'{prefix}_WORKERS', str(workers))), int(os.getenv(f'{prefix}_QUEUE', str(queue)))
+
+def get_report_cache_dir() -> str:
+    return os.getenv('REPORT_CACHE_DIR', 'report_cache')
+
+def get_report_cache_mb() -> float:
+    return float(os.getenv('REPORT_CACHE_MB', '1024'))
+
 __all__ = [
     'YearConfig',
     'year_config',
@@ -129,5 +192,12 @@ __all__ = [
     'get_historical_years',
     'refresh_year_config',
     'get_alerts_data_path',
-    'get_predictions_data_path'
+    'get_predictions_data_path',
+    'get_reload_interval',
+    'get_snapshot_dir',
+    'get_result_cache_mb',
+    'get_summary_report_cache_mb',
+    'get_bulkhead_limits',
+    'get_report_cache_dir',
+    'get_report_cache_mb'
 ]
\ No newline at end of file
@@ -1,19 +1,98 @@
+import copy
+import threading
 import pandas as pd
 from datetime import datetime
 
-class DataStore:
-    df = pd.DataFrame()
-    last_loaded = datetime.now()
-    loading = False
-    load_error = ''
-    indices = {}
-    is_ready = False
-    ml_models = {}
-    anomaly_detector = None
-    cluster_model = None
-    feature_importance = None
-    prediction_cache = {}
-    anomaly_feature_columns = []
-
-
-data_store = DataStore()
\ No newline at end of file
+from backend.app.config import YearConfig, year_config
+
+
+class Snapshot:
+    version = 0
+
+    def publish(self, staged: 'Snapshot') -> None:
+        """Swap in a fully built store in a single step.
+
+        The instance ``__dict__`` is replaced rather than mutated, so anything
+        holding a ``snapshot()`` (or an attribute it already read) keeps seeing
+        the previous state until it is done with it.
+        """
+        staged.version = self.version + 1
+        self.__dict__ = staged.__dict__
+
+    def snapshot(self):
+        view = object.__new__(type(self))
+        view.__dict__ = self.__dict__
+        return view
+
+
+class DataStore(Snapshot):
+    def __init__(self):
+        self.df = pd.DataFrame()
+        self.last_loaded = datetime.now()
+        self.loading = False
+        self.load_error = ''
+        self.indices = {}
+        self.is_ready = False
+        self.models_ready = False
+        self.ml_models = {}
+        self.anomaly_detector = None
+        self.cluster_model = None
+        self.cluster_insights = None
+        self.feature_importance = None
+        self.prediction_cache = {}
+        self.anomaly_feature_columns = []
+        self.memory_report = {}
+        self.stage_timings = {}
+        self.summaries = {}
+        self.filter_index = {}
+        # School year the frame was restricted to, resolved when it was built.
+        self.current_year = None
+        # Source files this data was built from; '' until the final frame is in.
+        self.fingerprint = ''
+
+
+class PredictionStore(Snapshot):
+    def __init__(self):
+        self.df = pd.DataFrame()
+        self.cube = {}
+        self.student_index = {}
+        self.students = []
+        self.districts = []
+        self.schools = []
+        self.is_ready = False
+        self.stage_timings = {}
+        # School years of this data; the global ``year_config`` follows when
+        # it is published into the live store.
+        self.years: YearConfig = copy.copy(year_config)
+
+    def publish(self, staged: 'PredictionStore') -> None:
+        super().publish(staged)
+        # A reload builds into a staged store by publishing into it as well;
+        # only the live store's years are the process's.
+        if self is prediction_store:
+            year_config.adopt(self.years)
+
+
+data_store = DataStore()
+prediction_store = PredictionStore()
+
+# Held while several stores are published together, and by readers that need
+# them to agree with each other.
+_publish_lock = threading.Lock()
+
+
+def publish_all(*pairs: tuple[Snapshot, Snapshot]) -> None:
+    """Publish each ``(live, staged)`` pair as one step.
+
+    Each store's own swap is atomic already; this makes ``snapshots()`` see
+    either every store before the reload or every store after it.
+    """
+    with _publish_lock:
+        for live, staged in pairs:
+            live.publish(staged)
+
+
+def snapshots(*stores: Snapshot) -> tuple:
+    """``snapshot()`` of each store, taken from the same publish."""
+    with _publish_lock:
+        return tuple(store.snapshot() for store in stores)
@@ -1,11 +1,15 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
 from backend.app.utils.loader import load_and_process
-from backend.app.data_store import data_store
+from backend.app.data_store import data_store, prediction_store, snapshots
 from backend.app.services.predictions import load_and_process_data
 from backend.app.services.prediction_service import PredictionService
+from backend.app.services.reload_service import ReloadService
+from backend.app.services.report_job_service import ReportJobService
+from backend.app.config import get_reload_interval
+from backend.app.utils.bulkhead import bulkheads
 from backend.classes.FilterCriteria import FilterCriteria
 from backend.classes.AnalysisResponse import AnalysisResponse
 from backend.classes.FilterOptions import FilterOptions
@@ -41,74 +45,127 @@ app.add_middleware(
 
 @app.on_event('startup')
 def bootstrap():
-    load_and_process()
+    ReloadService.remember_sources()
     load_and_process_data()
+    ReloadService.load_in_background()
+    ReloadService.start_watcher(get_reload_interval())
     
 
 
-def ready():
-    if data_store.df is None:
+def ready(store=data_store):
+    if not store.is_ready:
         raise HTTPException(503, "loading")
 
 
 
 @app.post("/api/alerts/prediction-insights", response_model=AnalysisResponse)
-def prediction_insights(criteria: FilterCriteria):
+async def prediction_insights(criteria: FilterCriteria):
     ready()
-    return alerts.get_analysis(criteria)
+    return await bulkheads["analysis"].run(alerts.get_analysis, criteria)
 
 
 @app.get("/api/alerts/filter-options", response_model=FilterOptions)
-def filter_options():
+async def filter_options(request: Request):
     ready()
-    return alerts.get_filter_options()
+    hierarchy = await bulkheads["lookups"].run(alerts.get_filter_options)
+    headers = {"ETag": hierarchy.etag, "Cache-Control": "no-cache"}
+    if hierarchy.etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=hierarchy.options, media_type="application/json", headers=headers)
 
 
 
 @app.get("/api/alerts/schools/district/{districtCode}")
-def schools(districtCode: str | None = None):
+async def schools(districtCode: str | None = None):
     ready()
-    return alerts.get_schools(districtCode)
+    return await bulkheads["lookups"].run(alerts.get_schools, districtCode)
 
 
 @app.get("/api/alerts/grades/district/{districtCode}/school/{schoolCode}")
-def grades(districtCode: str | None = None, schoolCode: str | None = None):
+async def grades(districtCode: str | None = None, schoolCode: str | None = None):
     ready()
     print(f"Fetching grades for district: {districtCode}, school: {schoolCode}")
-    return alerts.get_grades(districtCode, schoolCode)
+    return await bulkheads["lookups"].run(alerts.get_grades, districtCode, schoolCode)
 
 
 @app.post("/api/alerts/download/report/{reportType}")
-def download_report(reportType: str, criteria: FilterCriteria):
+async def download_report(reportType: str, criteria: FilterCriteria, reportFormat: str = Query("xlsx", alias="format")):
     ready()
-    return alerts.download_report(criteria, reportType)
+    return await bulkheads["reports"].stream(alerts.download_report, criteria, reportType, reportFormat)
+
+
+@app.post("/api/alerts/download/report/{reportType}/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_report_job(reportType: str, criteria: FilterCriteria, reportFormat: str = Query("xlsx", alias="format")):
+    ready()
+    return await bulkheads["lookups"].run(ReportJobService.submit, criteria, reportType, reportFormat)
+
+
+@app.get("/api/alerts/report-jobs/{jobId}")
+async def report_job_status(jobId: str):
+    return await bulkheads["lookups"].run(ReportJobService.status, jobId)
+
+
+@app.get("/api/alerts/report-jobs/{jobId}/download")
+async def download_report_job(jobId: str):
+    return await bulkheads["lookups"].run(ReportJobService.download, jobId)
 
 
 @app.get("/api/predictions/students")
-def students():
-    return PredictionService.students()
+async def students():
+    ready(prediction_store)
+    return await bulkheads["lookups"].run(PredictionService.students)
 
 
 @app.get("/api/predictions/all-districts")
-def all_districts():
-    return PredictionService.all_districts()
+async def all_districts():
+    ready(prediction_store)
+    return await bulkheads["analysis"].run(PredictionService.all_districts)
 
 
 @app.post("/api/predictions/district")
-def district_summary(req: DataRequest):
-    return PredictionService.district(req)
+async def district_summary(req: DataRequest):
+    ready(prediction_store)
+    return await bulkheads["analysis"].run(PredictionService.district, req)
 
 
 @app.post("/api/predictions/school")
-def school_summary(req: DataRequest):
-    return PredictionService.school(req)
+async def school_summary(req: DataRequest):
+    ready(prediction_store)
+    return await bulkheads["analysis"].run(PredictionService.school, req)
 
 
 @app.post("/api/predictions/grade-details")
-def grade_summary(req: DataRequest):
-    return PredictionService.grade_details(req)
+async def grade_summary(req: DataRequest):
+    ready(prediction_store)
+    return await bulkheads["analysis"].run(PredictionService.grade_details, req)
 
 
 @app.post("/api/predictions/student-details")
-def student_summary(req: DataRequest):
-    return PredictionService.student_details(req)
+async def student_summary(req: DataRequest):
+    ready(prediction_store)
+    return await bulkheads["lookups"].run(PredictionService.student_details, req)
+
+
+@app.post("/api/admin/reload", status_code=status.HTTP_202_ACCEPTED)
+def reload_data():
+    started = ReloadService.reload_in_background()
+    return {"started": started, **ReloadService.status()}
+
+
+@app.get("/api/admin/stages")
+def stage_timings():
+    predictions, alerts = snapshots(prediction_store, data_store)
+    return {
+        "predictions": predictions.stage_timings,
+        "alerts": alerts.stage_timings,
+    }
+
+
+@app.get("/api/ready")
+def readiness():
+    return ReloadService.stages()
+
+
+@app.get("/api/admin/reload")
+def reload_status():
+    return ReloadService.status()
\ No newline at end of file
@@ -9,7 +9,6 @@ from sklearn.impute import SimpleImputer
 
 from backend.app.utils.logger import logger
 from backend.app.utils.model_file_utils import FileUtils
-from backend.app.data_store import data_store
 
 class AnomalyDetector:
     def train_anomaly_detector(self, df, force_retrain=True):
@@ -92,9 +91,6 @@ class AnomalyDetector:
             else:
                 logger.info("Using cached anomaly detection model")
 
-            data_store.anomaly_detector = model  #type:ignore
-            data_store.anomaly_feature_columns = features
-
             if len(X_df) > 0:
                 try:
                     anomaly_scores = -model.score_samples(X_df)
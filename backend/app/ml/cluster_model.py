@@ -10,7 +10,6 @@ from sklearn.cluster import KMeans
 
 from backend.app.utils.logger import logger
 from backend.app.utils.model_file_utils import FileUtils
-from backend.app.data_store import data_store
 
 
 class ClusterModel:
@@ -132,8 +131,6 @@ class ClusterModel:
                 logger.info("Successfully trained and saved new clustering model")
 
 
-            data_store.ml_models['cluster_model'] = model
-
             cluster_assignments = model.named_steps['cluster'].labels_
             df['CLUSTER'] = cluster_assignments
 
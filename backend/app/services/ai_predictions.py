@@ -5,13 +5,13 @@ from backend.app.data_store import data_store
 
 
 
-def apply_ai_predictions_to_dataset(df):
+def apply_ai_predictions_to_dataset(df, store=data_store):
     try:
         df['AI_RISK_SCORE'] = df.get('RISK_SCORE', 0)
 
-        if 'risk_predictor' in data_store.ml_models and 'feature_columns' in data_store.ml_models:
+        if 'risk_predictor' in store.ml_models and 'feature_columns' in store.ml_models:
             try:
-                feature_cols = data_store.ml_models['feature_columns']
+                feature_cols = store.ml_models['feature_columns']
                 missing_cols = [col for col in feature_cols if col not in df.columns]
 
                 if missing_cols:
@@ -20,11 +20,11 @@ def apply_ai_predictions_to_dataset(df):
                     X = df[feature_cols].copy()
                     X = X.fillna(X.mean())
 
-                    if 'imputer' in data_store.ml_models and 'scaler' in data_store.ml_models:
-                        X_imputed = data_store.ml_models['imputer'].transform(X[feature_cols])
-                        X_scaled = data_store.ml_models['scaler'].transform(X_imputed)
+                    if 'imputer' in store.ml_models and 'scaler' in store.ml_models:
+                        X_imputed = store.ml_models['imputer'].transform(X[feature_cols])
+                        X_scaled = store.ml_models['scaler'].transform(X_imputed)
 
-                        risk_predictor = data_store.ml_models['risk_predictor']
+                        risk_predictor = store.ml_models['risk_predictor']
 
                         if hasattr(risk_predictor, 'predict_proba'):
                             risk_probas = risk_predictor.predict_proba(X_scaled)
@@ -46,7 +46,7 @@ def apply_ai_predictions_to_dataset(df):
             df['PREDICTED_RISK_PROBABILITY'] = df['RISK_SCORE'] / 100
             df['AI_RISK_SCORE'] = df['RISK_SCORE']
 
-        if hasattr(data_store, 'anomaly_detector') and data_store.anomaly_detector is not None:
+        if store.anomaly_detector is not None:
             try:
                 features_to_use = []
 
@@ -70,9 +70,9 @@ def apply_ai_predictions_to_dataset(df):
 
                 X_anomaly = df[features_to_use].copy()
 
-                if hasattr(data_store.anomaly_detector, 'score_samples'):
+                if hasattr(store.anomaly_detector, 'score_samples'):
                     try:
-                        df['ANOMALY_SCORE'] = -data_store.anomaly_detector.score_samples(X_anomaly)
+                        df['ANOMALY_SCORE'] = -store.anomaly_detector.score_samples(X_anomaly)
 
                         min_score = df['ANOMALY_SCORE'].min()
                         max_score = df['ANOMALY_SCORE'].max()
@@ -1,27 +1,44 @@
 from fastapi import HTTPException
-from fastapi.responses import StreamingResponse
 import pandas as pd
 from typing import List, Optional
 from datetime import datetime
 import traceback
-import io
 import time
 
 from backend.app.services.filter_service import FilterService
-from backend.classes.SummaryStatistics import SummaryStatistics
 from backend.classes.AnalysisResponse import AnalysisResponse
 from backend.classes.FilterCriteria import FilterCriteria
-from backend.classes.FilterOptions import FilterOptions
 from backend.classes.GradeResponse import GradeResponse
 from backend.classes.SchoolResponse import SchoolResponse
-from backend.app.config import get_current_year
 from backend.app.data_store import data_store
 from backend.app.utils.logger import logger
 from backend.app.utils.alerts_utils import al_utils
+from backend.app.utils.single_flight import in_flight
+from backend.app.utils.bulkhead import BlockingStreamingResponse
+from backend.app.utils.xlsx_stream import stream_xlsx
+from backend.app.utils.columnar_stream import stream_arrow, stream_csv, stream_parquet
 from backend.app.services.generation_service import GenerationService
 from backend.app.services.report_service import ReportService
+from backend.app.services.summary_service import SummaryService
+from backend.app.services.hierarchy_service import FilterHierarchy, HierarchyService
 
-CURRENT_SCHOOL_YEAR = get_current_year()
+XLSX_MEDIA_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# Download file name stem for each report type.
+REPORT_FILENAMES = {
+    'below_85': 'attendance_below_85',
+    'tier1': 'tier1_attendance',
+    'tier4': 'tier4_attendance',
+    'summary': 'attendance_summary',
+    'detailed': 'attendance_detailed',
+}
+# Media type and streaming writer for each download format; the format name
+# is also the file extension.
+REPORT_FORMATS = {
+    'xlsx': (XLSX_MEDIA_TYPE, stream_xlsx),
+    'csv': ('text/csv; charset=utf-8', stream_csv),
+    'parquet': ('application/vnd.apache.parquet', stream_parquet),
+    'arrow': ('application/vnd.apache.arrow.file', stream_arrow),
+}
 
 
 def get_analysis(search_criteria: FilterCriteria):
@@ -37,12 +54,26 @@ def get_analysis(search_criteria: FilterCriteria):
         logger.error(error_msg)
         raise HTTPException(status_code=503, detail=error_msg)
         
+    store = data_store.snapshot()
+    cache_key = GenerationService.cache_key(search_criteria, store.version)
+    # Identical requests arriving together wait for the first one's result.
+    return in_flight.run(('analysis',) + cache_key, _analyze, store, search_criteria, cache_key)
+
+
+def _analyze(store, search_criteria: FilterCriteria, cache_key: tuple):
     try:
         start_time = time.time()
         logger.info("Starting data processing...")
         
+        cached = GenerationService.cache.get(cache_key)
+        summary = SummaryService.lookup(store.summaries, search_criteria)
+        if cached is not None and summary is not None:
+            insights, recommendations = cached
+            logger.info(f'AI analysis served from cache in {time.time() - start_time:.4f} seconds')
+            return AnalysisResponse(summaryStatistics=summary, keyInsights=insights, recommendations=recommendations)
+
         try:
-            df = data_store.df.copy() #type:ignore
+            df = store.df #type:ignore
             if df is None or df.empty:
                 raise ValueError("DataFrame is empty or None")
                 
@@ -65,7 +96,7 @@ def get_analysis(search_criteria: FilterCriteria):
         if any([search_criteria.districtCode, search_criteria.gradeCode, search_criteria.schoolCode]):
             logger.info("Applying filters to dataset...")
             try:
-                df = FilterService.filter_data(df, district_code=search_criteria.districtCode, school_code=search_criteria.schoolCode, grade_code=search_criteria.gradeCode).copy()
+                df = FilterService.filter_data(df, district_code=search_criteria.districtCode, school_code=search_criteria.schoolCode, grade_code=search_criteria.gradeCode, index=store.filter_index, year=store.current_year)
                 logger.info(f"Filtered dataset size: {len(df)} rows")
             except Exception as filter_error:
                 logger.error(f"Error in FilterService.filter_data: {str(filter_error)}")
@@ -77,40 +108,20 @@ def get_analysis(search_criteria: FilterCriteria):
             logger.warning(error_msg)
             raise HTTPException(status_code=404, detail=error_msg)
         
-        total_students = len(df)
-        
-        if 'Predictions' in df.columns:
-            attendance_series = df['Predictions'] * 100
-        elif 'Predicted_Attendance' in df.columns:
-            attendance_series = df['Predicted_Attendance']
-        else:
+        attendance_series = SummaryService.attendance(df)
+        if attendance_series is None:
             raise HTTPException(status_code=500, detail='No attendance data available in the dataset')
             
-        tier_series = attendance_series.apply(al_utils.assign_tiers)
-        risk_level_series = attendance_series.apply(al_utils.assign_risk_level)
+        tier_series = al_utils.classify_tiers(attendance_series)
+        risk_level_series = al_utils.classify_risk_levels(attendance_series)
         df = df.assign(TIER=tier_series, RISK_LEVEL=risk_level_series)
         
-        below_85_mask = attendance_series < 85
-        critical_risk_mask = risk_level_series == 'Critical'
-        tier_counts = tier_series.value_counts()
-        tier4, tier3, tier2, tier1 = int(tier_counts.get('Tier 4', 0)), int(tier_counts.get('Tier 3', 0)), int(tier_counts.get('Tier 2', 0)), int(tier_counts.get('Tier 1', 0))
-        below_85_students, critical_risk_students = int(below_85_mask.sum()), int(critical_risk_mask.sum())
-        
-        school_prediction = round(df['Predictions_School'].mean() * 100, 1) if 'Predictions_School' in df.columns and not df['Predictions_School'].isna().all() else None
-        grade_prediction = round(df['Predictions_Grade'].mean() * 100, 1) if 'Predictions_Grade' in df.columns and not df['Predictions_Grade'].isna().all() else None
+        summary = summary or SummaryService.summarize(df)
         
-        summary = SummaryStatistics(
-            totalStudents=total_students, below85Students=below_85_students, 
-            below85Percentage=below_85_students / total_students * 100 if total_students else 0.0, 
-            tier4Students=tier4, tier4Percentage=tier4 / total_students * 100 if total_students else 0.0, 
-            tier3Students=tier3, tier3Percentage=tier3 / total_students * 100 if total_students else 0.0, 
-            tier2Students=tier2, tier2Percentage=tier2 / total_students * 100 if total_students else 0.0, 
-            tier1Students=tier1, tier1Percentage=tier1 / total_students * 100 if total_students else 0.0,
-            schoolPrediction=school_prediction, gradePrediction=grade_prediction
-        )
-        
-        insights = GenerationService.generate_insights(df)
-        recommendations = GenerationService.generate_recommendations(df)
+        aggregates = GenerationService.aggregate(df)
+        insights = GenerationService.generate_insights(df, aggregates)
+        recommendations = GenerationService.generate_recommendations(df, aggregates)
+        GenerationService.cache.put(cache_key, (insights, recommendations))
         logger.info(f'AI analysis completed in {time.time() - start_time:.4f} seconds')
         return AnalysisResponse(summaryStatistics=summary, keyInsights=insights, recommendations=recommendations)
     except Exception as e:
@@ -118,172 +129,35 @@ def get_analysis(search_criteria: FilterCriteria):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def get_filter_options():
+def get_filter_options() -> FilterHierarchy:
     if not data_store.is_ready:
         raise HTTPException(status_code=503, detail='Data is still being loaded. Please try again shortly.')
     
     try:
-        df = data_store.df
-        district_map = {}
-        
-        for (district_code, district_name), district_df in df.groupby(['DISTRICT_CODE', 'DISTRICT_NAME']): #type:ignore
-            district_code, district_name = str(district_code).strip(), str(district_name).strip()
-            schools_in_district = []
-            logger.debug(f"Processing district: {district_name} (Code: {district_code})")
-            
-            for (school_name, location_id), school_df in district_df.groupby(['SCHOOL_NAME', 'LOCATION_ID']):
-                school_name, school_code = str(school_name).strip(), str(location_id).strip()
-                logger.debug(f"  Processing school: {school_name} (ID: {school_code})")
-                
-                grades_in_school = []
-                for grade in school_df['STUDENT_GRADE_LEVEL'].dropna().unique():
-                    grade_str = str(grade).strip()
-                    if not grade_str or grade_str.lower() == 'nan':
-                        continue
-                        
-                    grade_entry = {'value': grade_str, 'label': f"Grade {grade_str}", 'school': school_code, 'district': district_code}
-                    grades_in_school.append(grade_entry)
-                    logger.debug(f"    Added grade: {grade_entry}")
-                    
-                if not grades_in_school:
-                    logger.warning(f"No grades found for school: {school_name} (ID: {school_code})")
-                    continue
-                
-                school_entry = {'value': school_code, 'label': school_name, 'district': district_code, 'district_name': district_name, 'location_id': str(location_id).strip(), 'grades': grades_in_school}
-                schools_in_district.append(school_entry)
-                logger.debug(f"  Added school: {school_name} (ID: {school_code}) with {len(grades_in_school)} grades")
-            
-            district_map[district_code] = {'value': district_code, 'label': district_name, 'schools': schools_in_district}
-            logger.debug(f"Added district: {district_name} (Code: {district_code}) with {len(schools_in_district)} schools")
-        
-        districts = [district_map[d] for d in sorted(district_map.keys())]
-        flat_districts = [{'value': d['value'], 'label': d['label']} for d in districts]
-        
-        flat_schools = []
-        for district in districts:
-            for school in district['schools']:
-                flat_schools.append({'value': school['value'], 'label': school['label'], 'districtCode': school['district']})
-        
-        flat_grades = []
-        grade_count = 0
-        
-        logger.debug("Processing grades for all schools...")
-        for district in districts:
-            logger.debug(f"  District: {district['label']} ({district['value']})")
-            for school in district['schools']:
-                school_grade_count = 0
-                logger.debug(f"School: {school['label']} ({school['value']})")
-                logger.debug(f"Raw grades data: {school.get('grades', [])}")
-                
-                for grade in school.get('grades', []):
-                    grade_value = str(grade.get('value', '')).strip().upper()
-                    if not grade_value.startswith('G'):
-                        grade_value = f"G{grade_value}"
-                    
-                    grade_entry = {'value': grade_value, 'label': f"Grade {grade_value.replace('G', '')}", 'schoolCode': school['value'], 'districtCode': district['value']}
-                    flat_grades.append(grade_entry)
-                    school_grade_count += 1
-                    grade_count += 1
-                
-                logger.debug(f"    Processed {school_grade_count} grades for school {school['label']}")
-        
-        logger.debug(f"Total grades processed: {grade_count}")
-        if flat_grades:
-            logger.debug(f"Sample grade entries: {flat_grades[:3]}...")
-        else:
-            logger.warning("No grades were processed for any school")
-        
-        result = FilterOptions(districts=flat_districts, schools=sorted(flat_schools, key=lambda x: x['label']), grades=flat_grades) #type:ignore
-        logger.debug(f"Returning filter options with {len(flat_districts)} districts, {len(flat_schools)} schools, and {len(flat_grades)} grades")
-        logger.debug(f"Sample grades in response: {flat_grades[:3]}")
-        return result
+        return HierarchyService.get(data_store.snapshot())
     except Exception as e:
         logger.error(f'Error retrieving filter options: {str(e)}')
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=f'Error retrieving filter options: {str(e)}')
 
 
-def download_report(criteria: FilterCriteria, report_type: str):
+def download_report(criteria: FilterCriteria, report_type: str, report_format: str = 'xlsx'):
     try:
-        logger.info(f"Starting report generation for type: {report_type}")
+        logger.info(f"Starting report generation for type: {report_type} ({report_format})")
         logger.info(f"Filters - District: {criteria.districtCode}, School: {criteria.schoolCode}, Grade: {criteria.gradeCode}")
         
         if not data_store.is_ready:
             raise HTTPException(status_code=503, detail='Data not loaded yet')
             
-        df = data_store.df.copy() #type:ignore
-        logger.info(f"Initial data shape: {df.shape}")
-        
-        if any([criteria.districtCode, criteria.gradeCode, criteria.schoolCode]):
-            logger.info("Applying filters to data...")
-            df = FilterService.filter_data(df, district_code=criteria.districtCode, grade_code=criteria.gradeCode, school_code=criteria.schoolCode)
-            logger.info(f"Data shape after filtering: {df.shape}")
-        
-        if len(df) == 0:
-            error_msg = f"No data found for the selected filters. District: {criteria.districtCode}, School: {criteria.schoolCode}, Grade: {criteria.gradeCode}"
-            logger.warning(error_msg)
-            raise HTTPException(status_code=404, detail=error_msg)
-        
-        if 'Predictions' in df.columns:
-            df['Predicted_Attendance'] = df['Predictions'] * 100
-        elif 'Predicted_Attendance' not in df.columns:
-            logger.error("No attendance data available in the dataset")
-            raise HTTPException(status_code=500, detail='No attendance data available in the dataset. Please ensure the data contains either Predictions or Predicted_Attendance column.')
-        
-        df['TIER'] = df['Predicted_Attendance'].apply(al_utils.assign_tiers)
-        
+        report_format = check_report_format(report_format)
+        store = data_store.snapshot()
         report_type = report_type.lower()
-        logger.info(f"Generating {report_type} report...")
-        
-        if report_type == 'below_85':
-            report_df = df[df['Predicted_Attendance'] < 85].copy()
-            logger.info(f"Found {len(report_df)} students with attendance below 85%")
-            if len(report_df) == 0:
-                raise HTTPException(status_code=404, detail='No students found with attendance below 85% for the selected filters.')
-            report_df = report_df.sort_values('Predicted_Attendance')
-            report_df = ReportService.generate_detailed_report(report_df)
-            filename = f"attendance_below_85_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-        elif report_type == 'tier1':
-            report_df = df[df['TIER'] == 'Tier 1'].copy()
-            logger.info(f"Found {len(report_df)} students in Tier 1 (≥95% attendance)")
-            if len(report_df) == 0:
-                raise HTTPException(status_code=404, detail='No students found in Tier 1 (≥95% attendance) for the selected filters.')
-            report_df = report_df.sort_values('Predicted_Attendance', ascending=False)
-            report_df = ReportService.generate_detailed_report(report_df)
-            filename = f"tier1_attendance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-        elif report_type == 'tier4':
-            report_df = df[df['TIER'] == 'Tier 4'].copy()
-            logger.info(f"Found {len(report_df)} students in Tier 4 (<80% attendance)")
-            if len(report_df) == 0:
-                raise HTTPException(status_code=404, detail='No students found in Tier 4 (<80% attendance) for the selected filters.')
-            report_df = report_df.sort_values('Predicted_Attendance')
-            report_df = ReportService.generate_detailed_report(report_df)
-            filename = f"tier4_attendance_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-        elif report_type == 'summary':
-            report_df = ReportService.generate_summary_report(df)
-            filename = f"attendance_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-        elif report_type == 'detailed':
-            report_df = ReportService.generate_detailed_report(df)
-            filename = f"attendance_detailed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            
-        else:
-            error_msg = f'Invalid report type: {report_type}. Valid types are: below_85, tier1, tier4, summary, detailed'
-            logger.error(error_msg)
-            raise HTTPException(status_code=400, detail=error_msg)
-        
-        output = io.BytesIO()
-        report_df.to_excel(output, index=False)
-        output.seek(0)
-        
-        content_type = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        headers = {'Content-Disposition': f'attachment; filename={filename}', 'Access-Control-Expose-Headers': 'Content-Disposition'}
+        report_df = build_report(store, criteria, report_type)
         
-        logger.info(f"Successfully generated {report_type} report with {len(report_df)} rows")
-        return StreamingResponse(output, media_type=content_type, headers=headers)
+        media_type, writer = REPORT_FORMATS[report_format]
+        logger.info(f"Streaming {report_type} report with {len(report_df)} rows as {report_format}")
+        body = _logged_stream(writer(report_df), report_type, report_format)
+        return BlockingStreamingResponse(body, media_type=media_type, headers=report_headers(report_type, report_format))
         
     except HTTPException:
         raise
@@ -294,6 +168,110 @@ def download_report(criteria: FilterCriteria, report_type: str):
         raise HTTPException(status_code=500, detail=f'An error occurred while generating the report. Please try again later.')
 
 
+def _logged_stream(chunks, report_type: str, report_format: str):
+    """``chunks``, logging a failure after the response has started, which
+    can no longer become an error response."""
+    try:
+        yield from chunks
+    except Exception as e:
+        logger.error(f'Error streaming {report_type} report as {report_format}: {str(e)}')
+        logger.error(traceback.format_exc())
+        raise
+
+
+def build_report(store, criteria: FilterCriteria, report_type: str) -> pd.DataFrame:
+    """The rows of a ``report_type`` report (already lower-cased) for ``criteria``."""
+    # A cached summary needs none of the row-level preparation.
+    if report_type != 'summary':
+        df = _report_frame(store, criteria)
+    logger.info(f"Generating {report_type} report...")
+    
+    if report_type == 'below_85':
+        report_df = df[df['Predicted_Attendance'] < 85]
+        logger.info(f"Found {len(report_df)} students with attendance below 85%")
+        if len(report_df) == 0:
+            raise HTTPException(status_code=404, detail='No students found with attendance below 85% for the selected filters.')
+        report_df = report_df.sort_values('Predicted_Attendance')
+        report_df = ReportService.generate_detailed_report(report_df)
+        
+    elif report_type == 'tier1':
+        report_df = df[df['TIER'] == 'Tier 1']
+        logger.info(f"Found {len(report_df)} students in Tier 1 (≥95% attendance)")
+        if len(report_df) == 0:
+            raise HTTPException(status_code=404, detail='No students found in Tier 1 (≥95% attendance) for the selected filters.')
+        report_df = report_df.sort_values('Predicted_Attendance', ascending=False)
+        report_df = ReportService.generate_detailed_report(report_df)
+        
+    elif report_type == 'tier4':
+        report_df = df[df['TIER'] == 'Tier 4']
+        logger.info(f"Found {len(report_df)} students in Tier 4 (<80% attendance)")
+        if len(report_df) == 0:
+            raise HTTPException(status_code=404, detail='No students found in Tier 4 (<80% attendance) for the selected filters.')
+        report_df = report_df.sort_values('Predicted_Attendance')
+        report_df = ReportService.generate_detailed_report(report_df)
+        
+    elif report_type == 'summary':
+        cache_key = (SummaryService.key(criteria), store.version)
+        report_df = in_flight.run(('summary_report',) + cache_key, _summary_report, store, criteria, cache_key)
+        
+    elif report_type == 'detailed':
+        report_df = ReportService.generate_detailed_report(df)
+        
+    else:
+        error_msg = f'Invalid report type: {report_type}. Valid types are: {", ".join(REPORT_FILENAMES)}'
+        logger.error(error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    
+    return report_df
+
+
+def check_report_format(report_format: str) -> str:
+    report_format = report_format.lower()
+    if report_format not in REPORT_FORMATS:
+        error_msg = f'Invalid report format: {report_format}. Valid formats are: {", ".join(REPORT_FORMATS)}'
+        logger.error(error_msg)
+        raise HTTPException(status_code=400, detail=error_msg)
+    return report_format
+
+
+def report_headers(report_type: str, report_format: str = 'xlsx') -> dict:
+    filename = f"{REPORT_FILENAMES[report_type]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{report_format}"
+    return {'Content-Disposition': f'attachment; filename={filename}', 'Access-Control-Expose-Headers': 'Content-Disposition'}
+
+
+def _report_frame(store, criteria: FilterCriteria) -> pd.DataFrame:
+    """Rows matching ``criteria`` with Predicted_Attendance and TIER set."""
+    df = store.df.copy(deep=False) #type:ignore
+    logger.info(f"Initial data shape: {df.shape}")
+    
+    if any([criteria.districtCode, criteria.gradeCode, criteria.schoolCode]):
+        logger.info("Applying filters to data...")
+        df = FilterService.filter_data(df, district_code=criteria.districtCode, grade_code=criteria.gradeCode, school_code=criteria.schoolCode, index=store.filter_index, year=store.current_year)
+        logger.info(f"Data shape after filtering: {df.shape}")
+    
+    if len(df) == 0:
+        error_msg = f"No data found for the selected filters. District: {criteria.districtCode}, School: {criteria.schoolCode}, Grade: {criteria.gradeCode}"
+        logger.warning(error_msg)
+        raise HTTPException(status_code=404, detail=error_msg)
+    
+    if 'Predictions' in df.columns:
+        df['Predicted_Attendance'] = df['Predictions'] * 100
+    elif 'Predicted_Attendance' not in df.columns:
+        logger.error("No attendance data available in the dataset")
+        raise HTTPException(status_code=500, detail='No attendance data available in the dataset. Please ensure the data contains either Predictions or Predicted_Attendance column.')
+    
+    df['TIER'] = al_utils.classify_tiers(df['Predicted_Attendance'])
+    return df
+
+
+def _summary_report(store, criteria: FilterCriteria, cache_key: tuple) -> pd.DataFrame:
+    report_df = ReportService.summary_cache.get(cache_key)
+    if report_df is not None:
+        logger.info("Summary report served from cache")
+        return report_df
+    return ReportService.summary_cache.put(cache_key, ReportService.generate_summary_report(_report_frame(store, criteria)))
+
+
 def get_schools(district: Optional[str] = None) -> List[SchoolResponse]:
     if not data_store.is_ready:
         raise HTTPException(
@@ -301,45 +279,13 @@ def get_schools(district: Optional[str] = None) -> List[SchoolResponse]:
             detail="Data is still being loaded. Please try again shortly."
         )
 
-    df = data_store.df
+    hierarchy = HierarchyService.get(data_store.snapshot())
 
     is_all = district is None or str(district).strip() in {"", "-1"}
     if is_all:
-        group_df = (
-            df.groupby(["DISTRICT_CODE", "LOCATION_ID", "SCHOOL_NAME"], as_index=False)
-              .first()
-        )
-
-        return [
-            SchoolResponse(
-                value=str(row["LOCATION_ID"]).strip(),
-                label=str(row["SCHOOL_NAME"]).strip(),
-                districtCode=str(row["DISTRICT_CODE"]).strip(),
-            )
-            for _, row in group_df.iterrows()
-        ]
+        return list(hierarchy.all_schools)
 
-    district = str(district).strip()
-
-    mask = df["DISTRICT_CODE"].astype(str).str.strip() == district
-    if not mask.any():                 
-        return []                     
-
-    filtered_df = df.loc[mask]
-
-    group_df = (
-        filtered_df.groupby(["LOCATION_ID", "SCHOOL_NAME"], as_index=False)
-                   .first()
-    )
-
-    return [
-        SchoolResponse(
-            value=str(row["LOCATION_ID"]).strip(),
-            label=str(row["SCHOOL_NAME"]).strip(),
-            districtCode=district,
-        )
-        for _, row in group_df.iterrows()
-    ]
+    return list(hierarchy.schools_by_district.get(str(district).strip(), []))
 
 
 
@@ -352,68 +298,16 @@ def get_grades(district: str | None = None, school: str | None = None) -> List[G
         if data_store.df is None:
             raise ValueError("No data available")
             
-        df = data_store.df.copy() #type:ignore
-        
-        if district:
-            district = str(district).strip()
-            df = df[df['DISTRICT_CODE'].astype(str).str.strip() == district]
-            
+        hierarchy = HierarchyService.get(data_store.snapshot())
+        district = str(district).strip() if district else None
+        school = str(school).strip() if school else None
+        location_id = None
         if school:
-            school = str(school).strip()
             location_id = school.split('-', 1)[1].strip() if '-' in school else school
             logger.debug(f"Filtering grades by school. Input: {school}, Extracted location_id: {location_id}")
-            df = df[df['LOCATION_ID'].astype(str).str.strip() == location_id]
-            logger.debug(f"Found {len(df)} students matching location_id {location_id}")
-        
-        if len(df) == 0:
-            return []
-            
-        grade_col = 'STUDENT_GRADE_LEVEL' if 'STUDENT_GRADE_LEVEL' in df.columns else 'GRADE_LEVEL'
-        if grade_col not in df.columns:
-            raise ValueError(f"Grade column '{grade_col}' not found in data")
-        
-        logger.debug(f"Available grade values before filtering: {df[grade_col].unique()}")
-        
-        def normalize_grade_value(grade):
-            if pd.isna(grade):
-                return None
-            grade_str = str(grade).strip()
-            if grade_str.upper() in ['PK', 'P', 'PRE-K', 'PREK', 'PRE-KINDERGARTEN']:
-                return '-1'
-            if grade_str.upper() in ['K', 'KG', 'KINDERGARTEN']:
-                return '0'
-                
-            try:
-                import re
-                match = re.search(r'\d+', grade_str)
-                if match:
-                    return match.group(0)
-                float_val = float(grade_str)
-                return str(int(float_val)) if float_val.is_integer() else grade_str
-            except (ValueError, TypeError):
-                return grade_str
-        
-        unique_grades = df[grade_col].dropna().apply(normalize_grade_value).dropna().unique()
-        logger.debug(f"Normalized grade values: {unique_grades}")
-        
-        def grade_sort_key(grade_str):
-            if not grade_str or pd.isna(grade_str):
-                return (float('inf'), '')
-                
-            grade_str = str(grade_str).strip()
-            
-            if grade_str == '-1' or grade_str.upper() in ['PK', 'P', 'PRE-K', 'PREK']:
-                return (-1, 'PK')
-            if grade_str == '0' or grade_str.upper() in ['K', 'KG']:
-                return (0, 'K')
-                
-            try:
-                num = int(grade_str)
-                return (num, str(num))
-            except (ValueError, TypeError):
-                return (float('inf'), grade_str)
         
-        return [GradeResponse(value=grade, label='PK' if grade == '-1' else ('K' if grade == '0' else grade), districtCode=district if district else None, schoolCode=school if school else None) for grade in sorted(unique_grades, key=grade_sort_key)]
+        grades = hierarchy.grades.get((district, location_id), [])
+        return [GradeResponse(value=grade, label='PK' if grade == '-1' else ('K' if grade == '0' else grade), districtCode=district, schoolCode=school) for grade in grades]
         
     except Exception as e:
         logger.error(f'Error getting grades: {str(e)}', exc_info=True)
@@ -1,16 +1,175 @@
+import numpy as np
 import pandas as pd
 import time
 
 from backend.app.utils.logger import logger
-from backend.app.config import get_current_year
+
+
+# Physical sort order of the alerts frame. The year comes first because every
+# filter is restricted to the current year, which keeps each current-year
+# district, school and grade in one contiguous run.
+LAYOUT_COLUMNS = ['SCHOOL_YEAR', 'DISTRICT_CODE', 'LOCATION_ID', 'STUDENT_GRADE_LEVEL']
+HIERARCHY_COLUMNS = ['DISTRICT_CODE', 'LOCATION_ID', 'STUDENT_GRADE_LEVEL']
 
 
 class FilterService:
-    CURRENT_SCHOOL_YEAR = get_current_year()
+    @staticmethod
+    def normalize_district_code(district_code: str) -> str:
+        district_code = str(district_code).strip()
+        if district_code.upper().startswith('D'):
+            return ''.join(filter(str.isdigit, district_code))
+        return district_code
+
+    @staticmethod
+    def normalize_grade_code(grade_code: str) -> str:
+        grade_code = str(grade_code).strip()
+        normalized_grade = grade_code.upper()
+        if normalized_grade in ['PK', 'PRE-K', 'PRE-KINDERGARTEN', '-1']:
+            return '-1'
+        if normalized_grade in ['K', 'KINDERGARTEN', '0']:
+            return '0'
+        normalized_grade = ''.join(filter(str.isdigit, grade_code))
+        return normalized_grade if normalized_grade else grade_code
+
+    @staticmethod
+    def normalize_grade(g):
+        if pd.isna(g):
+            return None
+        g = str(g).strip().upper()
+        if g in ['PK', 'PRE-K', 'PRE-KINDERGARTEN', '-1']:
+            return '-1'
+        if g in ['K', 'KINDERGARTEN', '0']:
+            return '0'
+        nums = ''.join(filter(str.isdigit, g))
+        return nums if nums else g
 
     @classmethod
-    def filter_data(cls, df, district_code=None, school_code=None, grade_code=None):
+    def index_keys(cls, df: pd.DataFrame) -> dict:
+        """Each filter column in the normalized form its filter compares against."""
+        keys = {}
+        for col in ['DISTRICT_CODE', 'LOCATION_ID', 'SCHOOL_YEAR']:
+            if col in df.columns:
+                keys[col] = df[col].astype(str).str.strip()
+        if 'STUDENT_GRADE_LEVEL' in df.columns:
+            keys['STUDENT_GRADE_LEVEL'] = df['STUDENT_GRADE_LEVEL'].apply(cls.normalize_grade)
+        return keys
+
+
+    @classmethod
+    def layout_order(cls, df: pd.DataFrame) -> np.ndarray:
+        """Stable row order by ``LAYOUT_COLUMNS``, numbers before other keys."""
+        keys = cls.index_keys(df)
+        sort_keys = []
+        for col in LAYOUT_COLUMNS:
+            if col in keys:
+                values = keys[col].astype(str)
+                sort_keys += [pd.to_numeric(values, errors='coerce').to_numpy(), pd.factorize(values, sort=True)[0]]
+        if not sort_keys:
+            return np.arange(len(df))
+        return np.lexsort(sort_keys[::-1])
+
+
+    @classmethod
+    def _offsets(cls, keys: dict, rows: int, year) -> dict:
+        """``(start, stop)`` of every ``year`` district, district/school and
+        district/school/grade whose rows are contiguous, keyed like
+        ``SummaryService.key`` with None for the unfiltered trailing levels.
+        """
+        if any(col not in keys for col in HIERARCHY_COLUMNS):
+            return {}
+        frame = pd.DataFrame({col: keys[col].to_numpy() for col in HIERARCHY_COLUMNS})
+        frame['position'] = np.arange(rows)
+        if 'SCHOOL_YEAR' in keys:
+            frame = frame[keys['SCHOOL_YEAR'].to_numpy() == str(year)]
+
+        offsets = {}
+        if len(frame) and frame['position'].iloc[-1] - frame['position'].iloc[0] + 1 == len(frame):
+            offsets[(None, None, None)] = (int(frame['position'].iloc[0]), int(frame['position'].iloc[-1]) + 1)
+        for level in range(1, len(HIERARCHY_COLUMNS) + 1):
+            runs = frame.groupby(HIERARCHY_COLUMNS[:level], sort=False)['position'].agg(['min', 'max', 'size'])
+            runs = runs[runs['max'] - runs['min'] + 1 == runs['size']]
+            for key, start, stop in zip(runs.index, runs['min'], runs['max']):
+                key = key if isinstance(key, tuple) else (key,)
+                offsets[key + (None,) * (len(HIERARCHY_COLUMNS) - level)] = (int(start), int(stop) + 1)
+        return offsets
+
+
+    @classmethod
+    def build_index(cls, df: pd.DataFrame, year) -> dict:
+        """Row positions of every normalized key value, per filter column.
+
+        Positions are ascending within each value, so a filter is the
+        intersection of at most four sorted arrays and costs time in
+        proportion to their sizes rather than to the frame's. When the frame
+        is in ``layout_order``, ``offsets`` turns a district, school or grade
+        filter into a single slice instead. The index only serves filters
+        for school ``year``.
+        """
+        index = {'rows': len(df), 'year': year}
+        keys = cls.index_keys(df)
+        for col, values in keys.items():
+            codes, uniques = pd.factorize(values)
+            order = np.argsort(codes, kind='stable')
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            index[col] = {key: order[bounds[i]:bounds[i + 1]] for i, key in enumerate(uniques)}
+        index['offsets'] = cls._offsets(keys, len(df), year)
+        logger.info(f"Built filter index: {', '.join(f'{col}={len(index[col])}' for col in index if col not in ('rows', 'year'))}")
+        return index
+
+
+    @classmethod
+    def _filter_indexed(cls, df, index, district_code=None, school_code=None, grade_code=None, year=None):
+        start_time = time.time()
+        district = cls.normalize_district_code(district_code) if district_code and district_code.strip() else None
+        school = str(school_code).strip() if school_code and school_code.strip() else None
+        grade = cls.normalize_grade_code(grade_code) if grade_code and grade_code.strip() else None
+        span = index.get('offsets', {}).get((district, school, grade))
+        if span is not None:
+            # A view on the store's rows; the shallow copy lets the key columns
+            # below be replaced without touching the frame it came from.
+            filtered_df = df.iloc[span[0]:span[1]].copy(deep=False)
+        else:
+            empty = np.empty(0, dtype=np.intp)
+            selections = []
+            for col, key in zip(HIERARCHY_COLUMNS, [district, school, grade]):
+                if key is not None:
+                    selections.append(index[col].get(key, empty))
+            if 'SCHOOL_YEAR' in index:
+                selections.append(index['SCHOOL_YEAR'].get(str(year), empty))
+
+            if selections:
+                selections.sort(key=len)
+                positions = selections[0]
+                for selection in selections[1:]:
+                    if len(positions) == 0:
+                        break
+                    positions = np.intersect1d(positions, selection, assume_unique=True)
+            else:
+                positions = np.arange(len(df))
+            filtered_df = df.take(positions)
+
+        for col in ['DISTRICT_CODE', 'STUDENT_ID']:
+            if col in filtered_df.columns:
+                filtered_df[col] = filtered_df[col].astype(str).str.strip()
+
+        logger.info(f'Indexed filtering (district={district_code}, school={school_code}, grade={grade_code}, year={year}) '
+                    f'completed in {time.time() - start_time:.4f} seconds, returning {len(filtered_df)} rows{" as a slice" if span else ""}')
+        return filtered_df
+
+
+    @classmethod
+    def filter_data(cls, df, district_code=None, school_code=None, grade_code=None, index=None, year=None):
+        """Rows matching the filters in school ``year``.
+
+        ``index`` is ``build_index`` of this same frame for the same year;
+        when given, the rows are looked up in it instead of scanning every
+        column.
+        """
         try:
+            wanted = ['DISTRICT_CODE', 'LOCATION_ID', 'STUDENT_GRADE_LEVEL'] + (['SCHOOL_YEAR'] if 'SCHOOL_YEAR' in df.columns else [])
+            if index and index.get('rows') == len(df) and index.get('year') == year and all(col in index for col in wanted):
+                return cls._filter_indexed(df, index, district_code, school_code, grade_code, year)
+
             start_time = time.time()
             mask = pd.Series(True, index=df.index)
             logger.info(f'Starting with {len(df)} rows')
@@ -76,30 +235,12 @@ class FilterService:
                     logger.info(f'All grade values in dataset (first 50): {sorted(all_grades.unique().tolist())[:50]}')
                 
                 try:
-                    normalized_grade = grade_code.upper()
-                    if normalized_grade in ['PK', 'PRE-K', 'PRE-KINDERGARTEN', '-1']:
-                        normalized_grade = '-1'
-                    elif normalized_grade in ['K', 'KINDERGARTEN', '0']:
-                        normalized_grade = '0'
-                    else:
-                        normalized_grade = ''.join(filter(str.isdigit, grade_code))
-                        normalized_grade = normalized_grade if normalized_grade else grade_code
+                    normalized_grade = cls.normalize_grade_code(grade_code)
                     
                     logger.info(f'Normalized grade code: {grade_code} -> {normalized_grade}')
                     
                     if 'GRADE_CODE' in actual_columns:
-                        def normalize_grade(g):
-                            if pd.isna(g):
-                                return None
-                            g = str(g).strip().upper()
-                            if g in ['PK', 'PRE-K', 'PRE-KINDERGARTEN', '-1']:
-                                return '-1'
-                            if g in ['K', 'KINDERGARTEN', '0']:
-                                return '0'
-                            nums = ''.join(filter(str.isdigit, g))
-                            return nums if nums else g
-                        
-                        normalized_grades = df[actual_columns['GRADE_CODE']].apply(normalize_grade)
+                        normalized_grades = df[actual_columns['GRADE_CODE']].apply(cls.normalize_grade)
                         
                         mask &= normalized_grades == normalized_grade
                         
@@ -115,12 +256,12 @@ class FilterService:
                 logger.info('No grade filter applied')
             
             if 'SCHOOL_YEAR' in df.columns and mask.any():
-                mask &= (df['SCHOOL_YEAR'].astype(str).str.strip() == str(cls.CURRENT_SCHOOL_YEAR))
-                logger.info(f'After school year filter ({cls.CURRENT_SCHOOL_YEAR}): {mask.sum()} rows remain')
+                mask &= (df['SCHOOL_YEAR'].astype(str).str.strip() == str(year))
+                logger.info(f'After school year filter ({year}): {mask.sum()} rows remain')
                 
                 if mask.sum() == 0 and len(df) > 0:
                     unique_years = df['SCHOOL_YEAR'].astype(str).unique()
-                    logger.warning(f'No data found for current school year {cls.CURRENT_SCHOOL_YEAR}. Available years: {unique_years}')
+                    logger.warning(f'No data found for school year {year}. Available years: {unique_years}')
             
             filtered_df = df[mask].copy()
             logger.info(f'Filtering completed in {time.time() - start_time:.4f} seconds, returning {len(filtered_df)} rows')
@@ -3,16 +3,33 @@ from typing import List
 
 from backend.app.utils.generate_insights import generate_ai_insights
 from backend.app.utils.generate_recommendations import generate_ai_recommendations
+from backend.app.utils.attendance_aggregates import AttendanceAggregates
+from backend.app.utils.result_cache import ResultCache
+from backend.app.services.summary_service import SummaryService
+from backend.app.config import get_result_cache_mb
+from backend.classes.FilterCriteria import FilterCriteria
 from backend.classes.KeyInsight import KeyInsight
 from backend.classes.Recommendation import Recommendation
 
 class GenerationService:
+    # (insights, recommendations) per normalized filter and dataset version.
+    cache = ResultCache('analysis', max_bytes=int(get_result_cache_mb() * 1024 * 1024))
+
+    @staticmethod
+    def cache_key(criteria: FilterCriteria, version: int) -> tuple:
+        return SummaryService.key(criteria), version
+
+
+    @classmethod
+    def aggregate(cls, df: pd.DataFrame) -> AttendanceAggregates:
+        return AttendanceAggregates(df)
+
 
     @classmethod
-    def generate_insights(cls, df: pd.DataFrame) -> List[KeyInsight]:
-        return generate_ai_insights(df)
+    def generate_insights(cls, df: pd.DataFrame, aggregates: AttendanceAggregates | None = None) -> List[KeyInsight]:
+        return generate_ai_insights(df, aggregates=aggregates)
 
     
     @classmethod
-    def generate_recommendations(cls, df: pd.DataFrame) -> List[Recommendation]:
-        return generate_ai_recommendations(df)
\ No newline at end of file
+    def generate_recommendations(cls, df: pd.DataFrame, aggregates: AttendanceAggregates | None = None) -> List[Recommendation]:
+        return generate_ai_recommendations(df, aggregates=aggregates)
\ No newline at end of file
@@ -0,0 +1,162 @@
+import hashlib
+import re
+import threading
+import orjson
+import pandas as pd
+
+from backend.app.utils.logger import logger
+from backend.classes.FilterOptions import FilterOptions
+from backend.classes.SchoolResponse import SchoolResponse
+
+
+HIERARCHY_COLUMNS = ['DISTRICT_CODE', 'DISTRICT_NAME', 'SCHOOL_NAME', 'LOCATION_ID', 'STUDENT_GRADE_LEVEL']
+
+
+def normalize_grade_value(grade):
+    if pd.isna(grade):
+        return None
+    grade_str = str(grade).strip()
+    if grade_str.upper() in ['PK', 'P', 'PRE-K', 'PREK', 'PRE-KINDERGARTEN']:
+        return '-1'
+    if grade_str.upper() in ['K', 'KG', 'KINDERGARTEN']:
+        return '0'
+
+    try:
+        match = re.search(r'\d+', grade_str)
+        if match:
+            return match.group(0)
+        float_val = float(grade_str)
+        return str(int(float_val)) if float_val.is_integer() else grade_str
+    except (ValueError, TypeError):
+        return grade_str
+
+
+def grade_sort_key(grade_str):
+    if not grade_str or pd.isna(grade_str):
+        return (float('inf'), '')
+
+    grade_str = str(grade_str).strip()
+
+    if grade_str == '-1' or grade_str.upper() in ['PK', 'P', 'PRE-K', 'PREK']:
+        return (-1, 'PK')
+    if grade_str == '0' or grade_str.upper() in ['K', 'KG']:
+        return (0, 'K')
+
+    try:
+        num = int(grade_str)
+        return (num, str(num))
+    except (ValueError, TypeError):
+        return (float('inf'), grade_str)
+
+
+class FilterHierarchy:
+    """District -> school -> grade tree for one dataset version.
+
+    ``options`` is the encoded ``FilterOptions`` body, ready to send as is,
+    and ``etag`` is derived from those bytes so every worker agrees on it.
+    ``all_schools``/``schools_by_district`` and ``grades`` answer the
+    cascading dropdown lookups; ``grades`` is keyed by stripped district code
+    and location id, with None for a dimension that is not filtered on.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        unique_rows = df[HIERARCHY_COLUMNS].drop_duplicates()
+        self._build_options(unique_rows)
+        self._build_schools(unique_rows)
+        self._build_grades(unique_rows)
+
+
+    def _build_options(self, unique_rows: pd.DataFrame):
+        rows = unique_rows.dropna(subset=HIERARCHY_COLUMNS[:4])
+        # Same order the nested groupbys visited them in: sorted by the group
+        # keys, grades in order of first appearance within their school.
+        rows = rows.sort_values(HIERARCHY_COLUMNS[:4], kind='stable')
+
+        district_map = {}
+        schools = {}
+        for district_code, district_name, school_name, location_id, grade in rows.itertuples(index=False):
+            district_code, district_name = str(district_code).strip(), str(district_name).strip()
+            school_code = str(location_id).strip()
+            group = (district_code, district_name)
+            if group not in schools:
+                schools[group] = {}
+                district_map[district_code] = {'value': district_code, 'label': district_name, 'schools': schools[group]}
+
+            school = schools[group].setdefault((school_name, location_id), {
+                'value': school_code, 'label': str(school_name).strip(), 'district': district_code, 'grades': [],
+            })
+            grade_str = str(grade).strip() if pd.notna(grade) else ''
+            if grade_str and grade_str.lower() != 'nan':
+                school['grades'].append(grade_str)
+
+        flat_districts, flat_schools, flat_grades = [], [], []
+        for district_code in sorted(district_map):
+            district = district_map[district_code]
+            flat_districts.append({'value': district['value'], 'label': district['label']})
+            for school in district['schools'].values():
+                if not school['grades']:
+                    logger.warning(f"No grades found for school: {school['label']} (ID: {school['value']})")
+                    continue
+                flat_schools.append({'value': school['value'], 'label': school['label'], 'districtCode': school['district']})
+                for grade in school['grades']:
+                    grade_value = grade.upper()
+                    if not grade_value.startswith('G'):
+                        grade_value = f"G{grade_value}"
+                    flat_grades.append({'value': grade_value, 'label': f"Grade {grade_value.replace('G', '')}", 'schoolCode': school['value'], 'districtCode': district['value']})
+
+        options = FilterOptions(districts=flat_districts, schools=sorted(flat_schools, key=lambda x: x['label']), grades=flat_grades) #type:ignore
+        self.options = orjson.dumps(options.model_dump())
+        self.etag = f'"{hashlib.sha256(self.options).hexdigest()[:32]}"'
+        logger.info(f'Built filter hierarchy: {len(flat_districts)} districts, {len(flat_schools)} schools, {len(flat_grades)} grades')
+
+
+    def _build_schools(self, unique_rows: pd.DataFrame):
+        rows = unique_rows.dropna(subset=['LOCATION_ID', 'SCHOOL_NAME'])
+        rows = rows.assign(district_key=rows['DISTRICT_CODE'].astype(str).str.strip())
+
+        self.all_schools = [
+            SchoolResponse(value=str(location_id).strip(), label=str(school_name).strip(), districtCode=str(district_code).strip())
+            for district_code, location_id, school_name in rows.dropna(subset=['DISTRICT_CODE'])
+                .sort_values(['DISTRICT_CODE', 'LOCATION_ID', 'SCHOOL_NAME'], kind='stable')
+                .drop_duplicates(['DISTRICT_CODE', 'LOCATION_ID', 'SCHOOL_NAME'])[['DISTRICT_CODE', 'LOCATION_ID', 'SCHOOL_NAME']]
+                .itertuples(index=False)
+        ]
+
+        self.schools_by_district = {}
+        by_district = rows.sort_values(['LOCATION_ID', 'SCHOOL_NAME'], kind='stable').drop_duplicates(['district_key', 'LOCATION_ID', 'SCHOOL_NAME'])
+        for district, location_id, school_name in by_district[['district_key', 'LOCATION_ID', 'SCHOOL_NAME']].itertuples(index=False):
+            self.schools_by_district.setdefault(district, []).append(
+                SchoolResponse(value=str(location_id).strip(), label=str(school_name).strip(), districtCode=district)
+            )
+
+
+    def _build_grades(self, unique_rows: pd.DataFrame):
+        districts = unique_rows['DISTRICT_CODE'].astype(str).str.strip()
+        locations = unique_rows['LOCATION_ID'].astype(str).str.strip()
+        values = unique_rows['STUDENT_GRADE_LEVEL'].map(normalize_grade_value)
+
+        # Rows are in order of first appearance, so each set keeps the order
+        # the grades were first seen in, which breaks ties in the sort below.
+        grades = {}
+        for district, location, grade in zip(districts, locations, values):
+            if grade is None:
+                continue
+            for key in [(district, location), (district, None), (None, location), (None, None)]:
+                grades.setdefault(key, {})[grade] = None
+
+        self.grades = {key: sorted(found, key=grade_sort_key) for key, found in grades.items()}
+
+
+class HierarchyService:
+    _lock = threading.Lock()
+    _version: int | None = None
+    _hierarchy: FilterHierarchy | None = None
+
+    @classmethod
+    def get(cls, store) -> FilterHierarchy:
+        """The hierarchy for ``store``'s data, built on first use of each version."""
+        with cls._lock:
+            if cls._hierarchy is None or cls._version != store.version:
+                cls._hierarchy = FilterHierarchy(store.df)
+                cls._version = store.version
+            return cls._hierarchy
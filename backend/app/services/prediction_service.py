@@ -1,43 +1,47 @@
 from backend.classes.DataRequest   import DataRequest
 from backend.classes.DataResponse  import DataResponse
 from backend.classes.StudentsResponse import StudentsResponse
-from backend.app.services.predictions  import (
-    cached_students,
-    cached_schools,
-    cached_districts,
-)
+from backend.app.data_store import prediction_store
+from backend.app.utils.single_flight import in_flight
 
 
 class PredictionService:
+    @staticmethod
+    def _shared(name: str, fn, req: DataRequest | None = None):
+        """Run ``fn``, sharing one call among identical concurrent requests."""
+        key = (name, prediction_store.version, tuple(sorted(req.model_dump().items())) if req is not None else None)
+        return in_flight.run(key, fn, *([req] if req is not None else []))
+
     @staticmethod
     def students() -> StudentsResponse:
+        store = prediction_store.snapshot()
         return {
-            "districts": cached_districts,
-            "schools": cached_schools,
-            "students": cached_students,
+            "districts": store.districts,
+            "schools": store.schools,
+            "students": store.students,
         } #type:ignore
 
     @staticmethod
     def all_districts() -> DataResponse:
         from backend.app.services.predictions import get_all_districts_summary
-        return get_all_districts_summary()
+        return PredictionService._shared('all_districts', get_all_districts_summary)
 
     @staticmethod
     def district(req: DataRequest) -> DataResponse:
         from backend.app.services.predictions import get_district_summary  # type:ignore
-        return get_district_summary(req)
+        return PredictionService._shared('district', get_district_summary, req)
 
     @staticmethod
     def school(req: DataRequest) -> DataResponse:
         from backend.app.services.predictions import get_school_summary # type:ignore
-        return get_school_summary(req)
+        return PredictionService._shared('school', get_school_summary, req)
 
     @staticmethod
     def grade_details(req: DataRequest) -> DataResponse:
         from backend.app.services.predictions import get_grade_summary # type:ignore
-        return get_grade_summary(req)
+        return PredictionService._shared('grade_details', get_grade_summary, req)
 
     @staticmethod
     def student_details(req: DataRequest) -> DataResponse:
         from backend.app.services.predictions import get_student_summary # type:ignore
-        return get_student_summary(req)
+        return PredictionService._shared('student_details', get_student_summary, req)
\ No newline at end of file
@@ -1,11 +1,10 @@
+import itertools
+import numpy as np
 import pandas as pd
-from backend.app.config import (
-    year_config,
-    get_current_year,
-    get_predicted_year,
-    get_historical_years,
-    YearConfig
-)
+from backend.app.config import YearConfig, get_predictions_data_path
+from backend.app.data_store import PredictionStore, prediction_store
+from backend.app.utils.snapshot_utils import SnapshotUtils
+from backend.app.utils.stage_timer import StageTimer
 from backend.classes.AttendanceValues import AttendanceValues
 from backend.classes.StudentMetrics import StudentMetrics
 from backend.classes.StudentTrend import StudentTrend
@@ -19,11 +18,9 @@ PRED_COL = "Predictions"
 PRED_DIST_COL = "Predictions_District"
 PRED_SCH_COL  = "Predictions_School"
 PRED_GRD_COL  = "Predictions_Grade"
-
-df = pd.DataFrame()
-cached_students : list[dict] = []
-cached_districts: list[dict] = []
-cached_schools  : list[dict] = []
+PRED_COLS = [PRED_COL, PRED_DIST_COL, PRED_SCH_COL, PRED_GRD_COL]
+CUBE_KEYS = ["DISTRICT_CODE", "LOCATION_ID", "STUDENT_GRADE_LEVEL"]
+CHRONIC_THRESHOLD = 0.85
 
 
 def _grade_to_str(g) -> str:
@@ -48,40 +45,136 @@ def _safe_int(val) -> int | None:
     return int(round(val))
 
 
-def _subset_pairs(data: pd.DataFrame):
-    cur, pred = get_current_year(), get_predicted_year()
+def _subset_pairs(data: pd.DataFrame, years: YearConfig):
+    cur, pred = years.current_year, years.predicted_year
     hist = data[data["SCHOOL_YEAR"] <= cur]
     pr   = data[data["SCHOOL_YEAR"] == pred]
     return hist, pr
 
 
-def _aggregate_metrics(hist: pd.DataFrame):
+def _mean(total, count):
+    return total / count if count else float("nan")
+
+
+def _build_cube(data: pd.DataFrame) -> dict[tuple[str, ...], pd.DataFrame]:
+    """Additive per-year sums for every (district, school, grade) key subset.
+
+    The finest level is grouped once from the raw frame; every coarser level
+    is rolled up from it, so a summary request is a single index lookup.
+    """
+    if data.empty:
+        return {}
+    parts = {col: data[col] for col in CUBE_KEYS + ["SCHOOL_YEAR"]}
+    parts["rows"] = pd.Series(1, index=data.index)
+    for name, col in (("present", PRESENT_COL), ("enrolled", ENROLLED_COL), ("unexcused", UNEXCUSED_COL)):
+        values = data[col].astype(float)
+        parts[f"{name}_sum"] = values
+        parts[f"{name}_n"] = values.notna().astype(int)
+    for col in PRED_COLS:
+        if col not in data.columns:
+            continue
+        values = data[col].astype(float)
+        parts[f"{col}_sum"] = values
+        parts[f"{col}_n"] = values.notna().astype(int)
+        parts[f"{col}_low"] = (values < CHRONIC_THRESHOLD).astype(int)
+
+    finest = (
+        pd.DataFrame(parts)
+        .groupby(CUBE_KEYS + ["SCHOOL_YEAR"], dropna=False)
+        .sum(min_count=0)
+        .reset_index()
+    )
+    out: dict[tuple[str, ...], pd.DataFrame] = {}
+    for size in range(len(CUBE_KEYS) + 1):
+        for keys in itertools.combinations(CUBE_KEYS, size):
+            out[keys] = (
+                finest.drop(columns=[k for k in CUBE_KEYS if k not in keys])
+                .groupby(list(keys) + ["SCHOOL_YEAR"], dropna=False)
+                .sum()
+                .sort_index()
+            )
+    return out
+
+
+def _build_student_index(data: pd.DataFrame) -> dict[int, tuple[int, int]]:
+    """Map each STUDENT_ID to its [start, stop) row span.
+
+    Expects ``data`` sorted by STUDENT_ID then SCHOOL_YEAR with a fresh
+    RangeIndex, so every student's history is one contiguous slice.
+    """
+    if data.empty:
+        return {}
+    ids = data["STUDENT_ID"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+    stops = np.r_[starts[1:], len(ids)]
+    return {
+        sid: (int(start), int(stop))
+        for sid, start, stop in zip(ids[starts].tolist(), starts, stops)
+    }
+
+
+def _cube_lookup(cube, district=None, location=None, grade=None) -> pd.DataFrame | None:
+    """Per-year cube rows for the given filters, or None when nothing matches."""
+    filters = [(k, v) for k, v in zip(CUBE_KEYS, (district, location, grade)) if v is not None]
+    table = cube.get(tuple(k for k, _ in filters))
+    if table is None:
+        return None
+    if not filters:
+        return table
+    try:
+        return table.loc[tuple(v for _, v in filters)]
+    except KeyError:
+        return None
+
+
+def _cube_metrics(stats: pd.DataFrame, years: YearConfig) -> list[StudentMetrics]:
     out: list[StudentMetrics] = []
-    for yr in get_historical_years():
-        yd = hist[hist["SCHOOL_YEAR"] == yr]
-        if yd.empty:
+    for yr in years.get_historical_years():
+        if yr not in stats.index:
             continue
-        pres_sum = yd[PRESENT_COL ].astype(float).sum()
-        enr_sum  = yd[ENROLLED_COL].astype(float).sum()
-        unx_mean = yd[UNEXCUSED_COL].astype(float).mean()
-        pres_mean= yd[PRESENT_COL ].astype(float).mean()
-        enr_mean = yd[ENROLLED_COL].astype(float).mean()
+        row = stats.loc[yr]
+        pres_sum, enr_sum = row["present_sum"], row["enrolled_sum"]
         rate = round((pres_sum / enr_sum) * 100) if enr_sum > 0 else None
         out.append(
             StudentMetrics(
                 year=str(yr),
                 attendanceRate=rate,
-                unexcused=_safe_int(unx_mean),
-                present=_safe_int(pres_mean),
-                total=_safe_int(enr_mean),
+                unexcused=_safe_int(_mean(row["unexcused_sum"], row["unexcused_n"])),
+                present=_safe_int(_mean(pres_sum, row["present_n"])),
+                total=_safe_int(_mean(enr_sum, row["enrolled_n"])),
             )
         )
     return out
 
 
-def _aggregate_trends(hist: pd.DataFrame, pred_value: float | None):
+def _cube_trends(stats: pd.DataFrame, pred_value: float | None, years: YearConfig):
     out: list[StudentTrend] = []
-    for yr in get_historical_years():
+    for yr in years.get_historical_years():
+        if yr not in stats.index:
+            continue
+        row = stats.loc[yr]
+        if row["enrolled_sum"] > 0:
+            out.append(
+                StudentTrend(
+                    year=str(yr),
+                    value=int(round((row["present_sum"] / row["enrolled_sum"]) * 100)),
+                    isPredicted=False,
+                )
+            )
+    if pred_value is not None:
+        out.append(
+            StudentTrend(
+                year=str(years.predicted_year),
+                value=int(round(pred_value * 100)),
+                isPredicted=True,
+            )
+        )
+    return out
+
+
+def _aggregate_trends(hist: pd.DataFrame, pred_value: float | None, years: YearConfig):
+    out: list[StudentTrend] = []
+    for yr in years.get_historical_years():
         yd = hist[hist["SCHOOL_YEAR"] == yr]
         if yd.empty:
             continue
@@ -98,7 +191,7 @@ def _aggregate_trends(hist: pd.DataFrame, pred_value: float | None):
     if pred_value is not None:
         out.append(
             StudentTrend(
-                year=str(get_predicted_year()),
+                year=str(years.predicted_year),
                 value=int(round(pred_value * 100)),
                 isPredicted=True,
             )
@@ -106,8 +199,8 @@ def _aggregate_trends(hist: pd.DataFrame, pred_value: float | None):
     return out
 
 
-def _zero_response() -> DataResponse:
-    p = get_predicted_year()
+def _zero_response(years: YearConfig) -> DataResponse:
+    p = years.predicted_year
     return DataResponse(
         previousAttendance=0,
         predictedAttendance=0,
@@ -118,217 +211,193 @@ def _zero_response() -> DataResponse:
     )
 
 
-def load_and_process_data() -> None:
-    global df, cached_students, cached_districts, cached_schools
-    cfg = YearConfig()
-    df = pd.read_parquet(cfg.predictions_data_path)
-    year_config.refresh_config()
-
-    hist, _ = _subset_pairs(df)
-    latest_hist = (
-        hist.sort_values(["STUDENT_ID", "SCHOOL_YEAR"])
-        .groupby("STUDENT_ID")
-        .tail(1)
-        .reset_index(drop=True)
-    )
+def load_and_process_data(store: PredictionStore = prediction_store) -> None:
+    staged = PredictionStore()
+    timer = StageTimer("predictions")
+    snapshot_utils = SnapshotUtils()
+    snapshot_utils.acquire("predictions")
+    try:
+        restored = timer.timed("snapshot_restore", snapshot_utils.restore, "predictions")
+        if restored is not None:
+            df = restored[0]
+        else:
+            with timer.stage("read_parquet"):
+                df = (
+                    pd.read_parquet(get_predictions_data_path())
+                    .sort_values(["STUDENT_ID", "SCHOOL_YEAR"], kind="stable")
+                    .reset_index(drop=True)
+                )
+            timer.timed("snapshot_save", snapshot_utils.save, "predictions", df)
+    finally:
+        snapshot_utils.release()
+    staged.years = YearConfig(df=df)
+    staged.df = df
+    staged.cube = timer.timed("build_cube", _build_cube, df)
+    staged.student_index = timer.timed("build_student_index", _build_student_index, df)
+
+    with timer.stage("build_lists"):
+        hist, _ = _subset_pairs(df, staged.years)
+        latest_hist = (
+            hist.sort_values(["STUDENT_ID", "SCHOOL_YEAR"])
+            .groupby("STUDENT_ID")
+            .tail(1)
+            .reset_index(drop=True)
+        )
 
-    cached_students[:] = sorted(
-        [
-            {
-                "id": str(int(r.STUDENT_ID)),
-                "grade": _grade_to_str(r.STUDENT_GRADE_LEVEL),
-                "locationId": _safe_int(r.LOCATION_ID) or -1,
-                "schoolName": (r.SCHOOL_NAME or "Unknown School").strip(),
-                "districtName": (r.DISTRICT_NAME or "Unknown District").strip(),
-                "districtId": _safe_int(r.DISTRICT_CODE) or -1,
-            }
-            for _, r in latest_hist.iterrows()
-        ],
-        key=lambda x: x["id"],
-    )
+        staged.students = sorted(
+            [
+                {
+                    "id": str(int(r.STUDENT_ID)),
+                    "grade": _grade_to_str(r.STUDENT_GRADE_LEVEL),
+                    "locationId": _safe_int(r.LOCATION_ID) or -1,
+                    "schoolName": (r.SCHOOL_NAME or "Unknown School").strip(),
+                    "districtName": (r.DISTRICT_NAME or "Unknown District").strip(),
+                    "districtId": _safe_int(r.DISTRICT_CODE) or -1,
+                }
+                for _, r in latest_hist.iterrows()
+            ],
+            key=lambda x: x["id"],
+        )
 
-    cached_districts[:] = (
-        df[["DISTRICT_CODE", "DISTRICT_NAME"]]
-        .drop_duplicates()
-        .assign(
-            id=lambda x: x.DISTRICT_CODE.fillna(-1).astype(int),
-            name=lambda x: x.DISTRICT_NAME.fillna("Unknown District").str.strip(),
+        staged.districts = (
+            df[["DISTRICT_CODE", "DISTRICT_NAME"]]
+            .drop_duplicates()
+            .assign(
+                id=lambda x: x.DISTRICT_CODE.fillna(-1).astype(int),
+                name=lambda x: x.DISTRICT_NAME.fillna("Unknown District").str.strip(),
+            )
+            .sort_values("id")
+            .to_dict("records")
         )
-        .sort_values("id")
-        .to_dict("records")
-    )
 
-    cached_schools[:] = (
-        df[["LOCATION_ID", "SCHOOL_NAME", "DISTRICT_CODE"]]
-        .drop_duplicates()
-        .assign(
-            id=lambda x: x.LOCATION_ID.fillna(-1).astype(int),
-            name=lambda x: x.SCHOOL_NAME.fillna("Unknown School").str.strip(),
-            districtId=lambda x: x.DISTRICT_CODE.fillna(-1).astype(int),
+        staged.schools = (
+            df[["LOCATION_ID", "SCHOOL_NAME", "DISTRICT_CODE"]]
+            .drop_duplicates()
+            .assign(
+                id=lambda x: x.LOCATION_ID.fillna(-1).astype(int),
+                name=lambda x: x.SCHOOL_NAME.fillna("Unknown School").str.strip(),
+                districtId=lambda x: x.DISTRICT_CODE.fillna(-1).astype(int),
+            )
+            .sort_values("id")
+            .to_dict("records")
         )
-        .sort_values("id")
-        .to_dict("records")
+
+    staged.is_ready = True
+    staged.stage_timings = timer.log()
+    store.publish(staged)
+
+
+def _cube_response(stats: pd.DataFrame | None, pred_col: str, years: YearConfig) -> DataResponse:
+    cur_year, pred_year = years.current_year, years.predicted_year
+    if stats is None or cur_year not in stats.index:
+        return _zero_response(years)
+    cur = stats.loc[cur_year]
+    prev_att = round((cur["present_sum"] / cur["enrolled_sum"]) * 100, 1)
+    total_days = round(_mean(cur["enrolled_sum"], cur["enrolled_n"]), 1)
+    pred = stats.loc[pred_year] if pred_year in stats.index else None
+    pred_value = (
+        _mean(pred[f"{pred_col}_sum"], pred[f"{pred_col}_n"])
+        if pred is not None and pred[f"{pred_col}_n"] > 0
+        else None
+    )
+    pred_att = round(pred_value * 100, 1) if pred_value is not None else 0
+    low = pred[f"{PRED_COL}_low"] if pred is not None else 0
+    chronic_absence_rate = round((low / cur["rows"]) * 100, 2)
+    return DataResponse(
+        previousAttendance = prev_att,
+        predictedAttendance = pred_att,
+        chronicAbsenceRate= chronic_absence_rate,
+        predictedValues = AttendanceValues(
+            year=str(pred_year), predictedAttendance=pred_att, totalDays=total_days
+        ),
+        metrics=_cube_metrics(stats, years),
+        trends=_cube_trends(stats, pred_value, years),
     )
 
 
 def get_all_districts_summary() -> DataResponse:
-    if df.empty:
-            return _zero_response()
-    
-    hist, pred = _subset_pairs(df)
-    cur_year = get_current_year()
-    cur_rows = hist[hist["SCHOOL_YEAR"] == cur_year]
-
-    if cur_rows.empty:
-        return _zero_response()
-    
-    
-    present_tot  = cur_rows[PRESENT_COL].astype(float).sum()
-    enrolled_tot = cur_rows[ENROLLED_COL].astype(float).sum()
+    store = prediction_store.snapshot()
+    years = store.years
+    stats = _cube_lookup(store.cube)
+    cur_year, pred_year = years.current_year, years.predicted_year
+    if stats is None or cur_year not in stats.index:
+        return _zero_response(years)
+
+    cur = stats.loc[cur_year]
+    present_tot, enrolled_tot = cur["present_sum"], cur["enrolled_sum"]
     prev_att = round((present_tot / enrolled_tot) * 100, 1) if enrolled_tot > 0 else 0
-    total_days = round(enrolled_tot / len(cur_rows), 1)
-    preds = pred[PRED_DIST_COL].dropna()
-    pred_att = round(preds.mean() * 100, 1) if not preds.empty else 0
-    chronic_absence_rate = round(((preds[preds < 0.85].shape[0]) / cur_rows.shape[0]) * 100, 2)
-    metrics = _aggregate_metrics(hist)
-    trends  = _aggregate_trends(hist, preds.mean() if not preds.empty else None)
-
+    total_days = round(enrolled_tot / cur["rows"], 1)
+    pred = stats.loc[pred_year] if pred_year in stats.index else None
+    pred_value = (
+        _mean(pred[f"{PRED_DIST_COL}_sum"], pred[f"{PRED_DIST_COL}_n"])
+        if pred is not None and pred[f"{PRED_DIST_COL}_n"] > 0
+        else None
+    )
+    pred_att = round(pred_value * 100, 1) if pred_value is not None else 0
+    low = pred[f"{PRED_DIST_COL}_low"] if pred is not None else 0
+    chronic_absence_rate = round((low / cur["rows"]) * 100, 2)
 
     return DataResponse(
         previousAttendance = prev_att,
         predictedAttendance = pred_att,
         chronicAbsenceRate= chronic_absence_rate,
         predictedValues = AttendanceValues(
-            year=str(get_predicted_year()),
+            year=str(pred_year),
             predictedAttendance=pred_att,
             totalDays=total_days,
         ),
-        metrics=metrics,
-        trends=trends,
+        metrics=_cube_metrics(stats, years),
+        trends=_cube_trends(stats, pred_value, years),
     )
 
 
 def get_district_summary(req: DataRequest) -> DataResponse:
+    store = prediction_store.snapshot()
     if req.districtId is None or req.locationID or req.studentId or req.grade != -3:
-        return _zero_response()
-    
-    subset = df[df["DISTRICT_CODE"] == req.districtId]
-    
-    if subset.empty:
-        return _zero_response()
-    
-    hist, pred = _subset_pairs(subset)
-    cur_year = get_current_year()
-    cur_rows = hist[hist["SCHOOL_YEAR"] == cur_year]
-
-    if cur_rows.empty:
-        return _zero_response()
-    
-    prev_att = round((cur_rows[PRESENT_COL].sum() / cur_rows[ENROLLED_COL].sum()) * 100, 1)
-    total_days = round(cur_rows[ENROLLED_COL].mean(), 1)
-    district_pred = pred[PRED_DIST_COL].dropna()
-    pred_att = round(district_pred.iloc[0] * 100, 1) if not district_pred.empty else 0
-    preds = pred[PRED_COL].dropna()
-    chronic_absence_rate = round(((preds[preds < 0.85].shape[0]) / cur_rows.shape[0]) * 100, 2)
-    metrics = _aggregate_metrics(hist)
-    trends = _aggregate_trends(hist, district_pred.iloc[0] if not district_pred.empty else None)
-    return DataResponse(
-        previousAttendance = prev_att,
-        predictedAttendance = pred_att,
-        chronicAbsenceRate= chronic_absence_rate,
-        predictedValues = AttendanceValues(
-            year=str(get_predicted_year()), predictedAttendance=pred_att, totalDays=total_days
-        ),
-        metrics=metrics,
-        trends=trends,
-    )
+        return _zero_response(store.years)
+    return _cube_response(_cube_lookup(store.cube, district=req.districtId), PRED_DIST_COL, store.years)
 
 
 def get_school_summary(req: DataRequest) -> DataResponse:
-    subset = df.copy()
-    if req.districtId is not None:
-        subset = subset[subset["DISTRICT_CODE"] == req.districtId]
-    if req.locationID is not None:
-        subset = subset[subset["LOCATION_ID"] == req.locationID]
-    if subset.empty:
-        return _zero_response()
-    hist, pred = _subset_pairs(subset)
-    cur_year = get_current_year()
-    cur_rows = hist[hist["SCHOOL_YEAR"] == cur_year]
-    if cur_rows.empty:
-        return _zero_response()
-    prev_att = round((cur_rows[PRESENT_COL].sum() / cur_rows[ENROLLED_COL].sum()) * 100, 1)
-    total_days = round(cur_rows[ENROLLED_COL].mean(), 1)
-    school_pred = pred[PRED_SCH_COL].dropna()
-    pred_att = round(school_pred.iloc[0] * 100, 1) if not school_pred.empty else 0
-    preds = pred[PRED_COL].dropna()
-    chronic_absence_rate = round(((preds[preds < 0.85].shape[0]) / cur_rows.shape[0]) * 100, 2)
-    metrics = _aggregate_metrics(hist)
-    trends = _aggregate_trends(hist, school_pred.iloc[0] if not school_pred.empty else None)
-    return DataResponse(
-        previousAttendance = prev_att,
-        predictedAttendance = pred_att,
-        chronicAbsenceRate= chronic_absence_rate,
-        predictedValues = AttendanceValues(
-            year=str(get_predicted_year()), predictedAttendance=pred_att, totalDays=total_days
-        ),
-        metrics=metrics,
-        trends=trends,
-    )
+    store = prediction_store.snapshot()
+    stats = _cube_lookup(store.cube, district=req.districtId, location=req.locationID)
+    return _cube_response(stats, PRED_SCH_COL, store.years)
 
 
 def get_grade_summary(req: DataRequest) -> DataResponse:
-    subset = df.copy()
-    if req.districtId is not None:
-        subset = subset[subset["DISTRICT_CODE"] == req.districtId]
-    if req.locationID is not None:
-        subset = subset[subset["LOCATION_ID"] == req.locationID]
-    if req.grade != -3:
-        subset = subset[subset["STUDENT_GRADE_LEVEL"] == req.grade]
-    if subset.empty:
-        return _zero_response()
-    hist, pred = _subset_pairs(subset)
-    cur_year = get_current_year()
-    cur_rows = hist[hist["SCHOOL_YEAR"] == cur_year]
-    if cur_rows.empty:
-        return _zero_response()
-    prev_att = round((cur_rows[PRESENT_COL].sum() / cur_rows[ENROLLED_COL].sum()) * 100, 1)
-    total_days = round(cur_rows[ENROLLED_COL].mean(), 1)
-    grade_pred = pred[PRED_GRD_COL].dropna()
-    pred_att = round(grade_pred.iloc[0] * 100, 1) if not grade_pred.empty else 0
-    preds = pred[PRED_COL].dropna()
-    chronic_absence_rate = round(((preds[preds < 0.85].shape[0]) / cur_rows.shape[0]) * 100, 2)
-    metrics = _aggregate_metrics(hist)
-    trends = _aggregate_trends(hist, grade_pred.iloc[0] if not grade_pred.empty else None)
-    return DataResponse(
-        previousAttendance = prev_att,
-        predictedAttendance = pred_att,
-        chronicAbsenceRate= chronic_absence_rate,
-        predictedValues = AttendanceValues(
-            year=str(get_predicted_year()), predictedAttendance=pred_att, totalDays=total_days
-        ),
-        metrics=metrics,
-        trends=trends,
+    store = prediction_store.snapshot()
+    if req.grade is None:
+        return _zero_response(store.years)
+    grade = req.grade if req.grade != -3 else None
+    stats = _cube_lookup(
+        store.cube, district=req.districtId, location=req.locationID, grade=grade
     )
+    return _cube_response(stats, PRED_GRD_COL, store.years)
 
 
 def get_student_summary(req: DataRequest) -> DataResponse:
-    subset = df.copy()
+    store = prediction_store.snapshot()
+    years = store.years
+    if req.studentId is not None:
+        span = store.student_index.get(req.studentId)
+        if span is None:
+            return _zero_response(years)
+        subset = store.df.iloc[span[0]:span[1]]
+    else:
+        subset = store.df
     if req.districtId is not None:
         subset = subset[subset["DISTRICT_CODE"] == req.districtId]
     if req.locationID is not None:
         subset = subset[subset["LOCATION_ID"] == req.locationID]
-    if req.studentId is not None:
-        subset = subset[subset["STUDENT_ID"] == req.studentId]
-    elif req.grade != -3:
+    if req.studentId is None and req.grade != -3:
         subset = subset[subset["STUDENT_GRADE_LEVEL"] == req.grade]
     if subset.empty:
-        return _zero_response()
-    hist, pred = _subset_pairs(subset)
-    cur_year  = get_current_year()
+        return _zero_response(years)
+    hist, pred = _subset_pairs(subset, years)
+    cur_year  = years.current_year
     cur_row   = hist[hist["SCHOOL_YEAR"] == cur_year]
     if cur_row.empty:
-        return _zero_response()
+        return _zero_response(years)
     cur_row = cur_row.iloc[-1]
     prev_att = round((cur_row[PRESENT_COL] / cur_row[ENROLLED_COL]) * 100, 1)
     total_days = round(cur_row[ENROLLED_COL], 1)
@@ -339,7 +408,7 @@ def get_student_summary(req: DataRequest) -> DataResponse:
         else round(float(cur_row[PRED_COL]) * 100, 1)
     )
     metrics: list[StudentMetrics] = []
-    for yr in get_historical_years():
+    for yr in years.get_historical_years():
         rw = hist[hist["SCHOOL_YEAR"] == yr]
         if rw.empty:
             continue
@@ -355,13 +424,13 @@ def get_student_summary(req: DataRequest) -> DataResponse:
                 total=_safe_int(enr),
             )
         )
-    trends = _aggregate_trends(hist, float(stu_pred.iloc[0]) if not stu_pred.empty else None)
+    trends = _aggregate_trends(hist, float(stu_pred.iloc[0]) if not stu_pred.empty else None, years)
     return DataResponse(
         previousAttendance = prev_att,
         predictedAttendance = pred_att,
         chronicAbsenceRate = 0,
         predictedValues = AttendanceValues(
-            year=str(get_predicted_year()), predictedAttendance=pred_att, totalDays=total_days
+            year=str(years.predicted_year), predictedAttendance=pred_att, totalDays=total_days
         ),
         metrics=metrics,
         trends=trends,
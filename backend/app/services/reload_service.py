@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from datetime import datetime
+
+from backend.app.config import get_alerts_data_path, get_predictions_data_path
+from backend.app.data_store import DataStore, PredictionStore, data_store, prediction_store, publish_all, snapshots
+from backend.app.services.generation_service import GenerationService
+from backend.app.services.predictions import load_and_process_data
+from backend.app.services.report_service import ReportService
+from backend.app.services.report_job_service import ReportJobService
+from backend.app.utils.loader import load_and_process
+from backend.app.utils.logger import logger
+from backend.app.utils.single_flight import in_flight
+from backend.app.utils.bulkhead import bulkheads
+
+
+class ReloadService:
+    _lock = threading.Lock()
+    _watcher: threading.Thread | None = None
+    _source_mtimes: dict = {}
+    last_started: datetime | None = None
+    last_finished: datetime | None = None
+    last_error = ''
+
+    @classmethod
+    def source_mtimes(cls) -> dict:
+        paths = [get_predictions_data_path(), get_alerts_data_path()]
+        return {path: os.path.getmtime(path) for path in paths if os.path.exists(path)}
+
+    @classmethod
+    def remember_sources(cls):
+        cls._source_mtimes = cls.source_mtimes()
+
+    @classmethod
+    def reload(cls) -> bool:
+        """Rebuild both stores off to the side, then publish them together.
+
+        Live requests keep serving the current snapshots for the whole build.
+        Returns False without doing anything if a reload is already running.
+        """
+        if not cls._lock.acquire(blocking=False):
+            return False
+        cls._reload()
+        return True
+
+    @classmethod
+    def _reload(cls):
+        """The body of ``reload``, run by whoever acquired the lock; releases it."""
+        try:
+            cls.last_started, cls.last_error = datetime.now(), ''
+            mtimes = cls.source_mtimes()
+            logger.info('Reloading data into a staged snapshot...')
+
+            staged_predictions = PredictionStore()
+            load_and_process_data(staged_predictions)
+
+            staged_alerts = DataStore()
+            load_and_process(staged_alerts, staged_predictions.years.current_year)
+            if not staged_alerts.models_ready:
+                raise RuntimeError(staged_alerts.load_error or 'Alerts data failed to load')
+
+            publish_all((prediction_store, staged_predictions), (data_store, staged_alerts))
+            GenerationService.cache.clear()
+            ReportService.summary_cache.clear()
+            cls._source_mtimes = mtimes
+            logger.info(f'Published data snapshot v{data_store.version} (predictions v{prediction_store.version})')
+        except Exception as e:
+            cls.last_error = str(e)
+            logger.error(f'Data reload failed, keeping current snapshot: {e}')
+        finally:
+            cls.last_finished = datetime.now()
+            cls._lock.release()
+
+    @classmethod
+    def load_in_background(cls):
+        """Run the first alerts load on the live store without blocking startup.
+
+        It holds the reload lock, so a reload requested meanwhile is refused
+        rather than racing the stages as they attach to ``data_store``.
+        """
+        cls._lock.acquire()
+
+        def run():
+            try:
+                cls.last_started = datetime.now()
+                load_and_process(data_store)
+                cls.last_error = data_store.load_error
+            finally:
+                cls.last_finished = datetime.now()
+                cls._lock.release()
+
+        threading.Thread(target=run, name='data-load', daemon=True).start()
+
+    @classmethod
+    def reload_in_background(cls) -> bool:
+        """Start a reload thread; False if a reload is already running.
+
+        The lock is taken here and handed to the thread, so of two concurrent
+        callers only one is told it started.
+        """
+        if not cls._lock.acquire(blocking=False):
+            return False
+        try:
+            threading.Thread(target=cls._reload, name='data-reload', daemon=True).start()
+        except BaseException:
+            cls._lock.release()
+            raise
+        return True
+
+    @classmethod
+    def start_watcher(cls, interval: float):
+        if cls._watcher is not None or interval <= 0:
+            return
+
+        def watch():
+            while True:
+                time.sleep(interval)
+                if cls.source_mtimes() != cls._source_mtimes:
+                    logger.info('Source parquet files changed, reloading data...')
+                    cls.reload()
+
+        cls._watcher = threading.Thread(target=watch, name='data-reload-watcher', daemon=True)
+        cls._watcher.start()
+        logger.info(f'Watching source parquet files every {interval:g} seconds')
+
+    @classmethod
+    def stages(cls, predictions=None, alerts=None) -> dict:
+        if predictions is None or alerts is None:
+            predictions, alerts = snapshots(prediction_store, data_store)
+        return {
+            'predictions': predictions.is_ready,
+            'alerts': alerts.is_ready,
+            'models': alerts.models_ready,
+        }
+
+    @classmethod
+    def status(cls) -> dict:
+        predictions, alerts = snapshots(prediction_store, data_store)
+        return {
+            'running': cls._lock.locked(),
+            'lastStarted': cls.last_started,
+            'lastFinished': cls.last_finished,
+            'lastError': cls.last_error,
+            'dataVersion': alerts.version,
+            'predictionsVersion': predictions.version,
+            'lastLoaded': alerts.last_loaded,
+            'stages': cls.stages(predictions, alerts),
+            'analysisCache': GenerationService.cache.stats(),
+            'summaryReportCache': ReportService.summary_cache.stats(),
+            'reportJobs': ReportJobService.stats(),
+            'coalescing': in_flight.stats(),
+            'bulkheads': {name: bulkhead.stats() for name, bulkhead in bulkheads.items()},
+        }
@@ -0,0 +1,374 @@
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.app.config import get_bulkhead_limits, get_report_cache_dir, get_report_cache_mb
+from backend.app.data_store import data_store
+from backend.app.services import alerts
+from backend.app.services.summary_service import SummaryService
+from backend.app.utils.disk_cache import DiskCache
+from backend.app.utils.logger import logger
+from backend.classes.FilterCriteria import FilterCriteria
+
+
+# Bump when the layout of a report file changes, so files cached by older
+# code are rebuilt rather than served.
+ARTIFACT_FORMAT = 1
+# Jobs remembered for status polls; older finished ones are forgotten first.
+MAX_JOBS = 1000
+READ_CHUNK = 1024 * 1024
+# A running job's marker is refreshed while it writes; one left alone this
+# long belongs to a process that died, and a failed one has been reported.
+MARKER_TTL = 600
+DOWNLOAD_PATH = '/api/alerts/report-jobs/{job_id}/download'
+
+_JOB_ID = re.compile(r'([a-z0-9_]+)-([a-z]+)-[0-9a-f]{32}')
+
+
+class _Job:
+    def __init__(self, job_id: str, report_type: str, report_format: str):
+        self.job_id = job_id
+        self.report_type = report_type
+        self.report_format = report_format
+        self.status = 'queued'
+        self.submitted = datetime.now()
+        self.finished: datetime | None = None
+        self.rows: int | None = None
+        self.status_code: int | None = None
+        self.error: str | None = None
+
+
+class ReportJobService:
+    """Report files built in the background on a worker pool of their own.
+
+    A job id is derived from the report type and format, the normalized
+    filter and the fingerprint of the loaded data. Submitting the same report again finds
+    the job already running or its finished file. Finished files are kept
+    in a size-bounded ``DiskCache``.
+
+    The worker process building a job claims it with a ``.<job id>.job``
+    marker file in the cache directory, so other processes sharing that
+    directory report it as running (or failed) rather than unknown, and do
+    not start the same build again.
+    """
+
+    cache = DiskCache('reports', get_report_cache_dir(), max_bytes=int(get_report_cache_mb() * 1024 * 1024))
+    workers, queue = get_bulkhead_limits('report_jobs', 2, 32)
+    _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-job')
+    _lock = threading.Lock()
+    _jobs: OrderedDict = OrderedDict()
+    _active = 0
+    # Seeds the Retry-After estimate until real build times come in.
+    avg_seconds = 30.0
+
+    @staticmethod
+    def job_id(criteria: FilterCriteria, report_type: str, report_format: str, fingerprint: str) -> str:
+        key = repr((ARTIFACT_FORMAT, report_type, report_format, SummaryService.key(criteria), fingerprint))
+        return f'{report_type}-{report_format}-{hashlib.sha256(key.encode()).hexdigest()[:32]}'
+
+
+    @staticmethod
+    def _parse(job_id: str) -> tuple[str, str]:
+        """Report type and format of ``job_id``; 404 for anything not shaped like one."""
+        match = _JOB_ID.fullmatch(job_id)
+        if match is None or match.group(1) not in alerts.REPORT_FILENAMES or match.group(2) not in alerts.REPORT_FORMATS:
+            raise HTTPException(status_code=404, detail=f'Unknown report job: {job_id}')
+        return match.group(1), match.group(2)
+
+
+    @classmethod
+    def submit(cls, criteria: FilterCriteria, report_type: str, report_format: str = 'xlsx') -> dict:
+        report_format = alerts.check_report_format(report_format)
+        report_type = report_type.lower()
+        if report_type not in alerts.REPORT_FILENAMES:
+            raise HTTPException(status_code=400, detail=f'Invalid report type: {report_type}. Valid types are: {", ".join(alerts.REPORT_FILENAMES)}')
+
+        store = data_store.snapshot()
+        if not store.fingerprint:
+            raise HTTPException(status_code=503, detail='Data is still being loaded. Please try again shortly.')
+
+        job_id = cls.job_id(criteria, report_type, report_format, store.fingerprint)
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is not None and job.status in ('queued', 'running'):
+                return cls._describe(job)
+            if cls.cache.contains(job_id):
+                return cls._describe_done(job_id, job)
+            marker = cls._marker(job_id)
+            if marker is not None and marker['status'] != 'failed':
+                return cls._describe_marker(job_id, marker)
+
+            if cls._active >= cls.workers + cls.queue:
+                retry_after = max(1, math.ceil(cls.avg_seconds * cls._active / cls.workers))
+                logger.warning(f'Report job queue full ({cls._active} active), rejecting {report_type} job, retry after {retry_after}s')
+                raise HTTPException(
+                    status_code=429,
+                    detail='Too many reports are being generated. Please try again shortly.',
+                    headers={'Retry-After': str(retry_after)},
+                )
+
+            job = _Job(job_id, report_type, report_format)
+            holder = cls._claim(job)
+            if holder is not None:
+                return cls._describe_marker(job_id, holder)
+            cls._jobs[job_id] = job
+            cls._jobs.move_to_end(job_id)
+            cls._active += 1
+            cls._prune()
+
+        logger.info(f'Queued report job {job_id} for filters {SummaryService.key(criteria)}')
+        cls._executor.submit(cls._run, job, store, criteria)
+        return cls._describe(job)
+
+
+    @classmethod
+    def _run(cls, job: _Job, store, criteria: FilterCriteria):
+        started = time.perf_counter()
+        status = 'failed'
+        with cls._lock:
+            job.status = 'running'
+            cls._update_marker(job)
+        try:
+            report_df = alerts.build_report(store, criteria, job.report_type)
+            job.rows = len(report_df)
+            _, writer = alerts.REPORT_FORMATS[job.report_format]
+            size = cls.cache.put(job.job_id, cls._heartbeat(job.job_id, writer(report_df)))
+            status = 'done'
+            logger.info(f'Report job {job.job_id} wrote {job.rows} rows ({size} bytes) in {time.perf_counter() - started:.2f} seconds')
+        except HTTPException as e:
+            job.status_code, job.error = e.status_code, e.detail
+            logger.warning(f'Report job {job.job_id} failed: {e.detail}')
+        except Exception as e:
+            job.status_code, job.error = 500, 'An error occurred while generating the report. Please try again later.'
+            logger.error(f'Report job {job.job_id} failed: {str(e)}')
+            logger.error(traceback.format_exc())
+        finally:
+            with cls._lock:
+                job.status = status
+                job.finished = datetime.now()
+                cls._update_marker(job)
+                cls._active -= 1
+                cls.avg_seconds = 0.8 * cls.avg_seconds + 0.2 * (time.perf_counter() - started)
+
+
+    @classmethod
+    def _prune(cls):
+        excess = len(cls._jobs) - MAX_JOBS
+        if excess > 0:
+            for job_id in [key for key, job in cls._jobs.items() if job.finished is not None][:excess]:
+                del cls._jobs[job_id]
+
+
+    @classmethod
+    def _marker_path(cls, job_id: str) -> str:
+        return os.path.join(cls.cache.directory, f'.{job_id}.job')
+
+
+    @staticmethod
+    def _marker_body(job: _Job) -> bytes:
+        return json.dumps({
+            'status': job.status,
+            'submitted': job.submitted.isoformat(),
+            'finished': job.finished.isoformat() if job.finished else None,
+            'statusCode': job.status_code,
+            'error': job.error,
+            'pid': os.getpid(),
+        }).encode()
+
+
+    @classmethod
+    def _marker(cls, job_id: str) -> dict | None:
+        """The job's marker as written by whichever process claimed it, or
+        None when there is none or it has outlived ``MARKER_TTL``."""
+        path = cls._marker_path(job_id)
+        try:
+            with open(path, 'rb') as f:
+                age = time.time() - os.fstat(f.fileno()).st_mtime
+                marker = json.loads(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+        if age > MARKER_TTL:
+            return None
+        return marker
+
+
+    @classmethod
+    def _claim(cls, job: _Job) -> dict | None:
+        """Create the job's marker, or return the live one another process holds.
+
+        A marker that has expired, or records a failure, is replaced so the
+        job can be built again.
+        """
+        path = cls._marker_path(job.job_id)
+        os.makedirs(cls.cache.directory, exist_ok=True)
+        # Written aside and linked into place, so the marker never exists
+        # without its contents and only one process can create it.
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(cls._marker_body(job))
+        try:
+            for _ in range(3):
+                try:
+                    os.link(temp_path, path)
+                    return None
+                except FileExistsError:
+                    marker = cls._marker(job.job_id)
+                    if marker is not None and marker['status'] != 'failed':
+                        return marker
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+        finally:
+            os.remove(temp_path)
+        # Other processes keep replacing it; leave the build to them.
+        return cls._marker(job.job_id) or json.loads(cls._marker_body(job))
+
+
+    @classmethod
+    def _update_marker(cls, job: _Job):
+        """Record the job's status in its marker for other processes, or drop
+        the marker once the file is in the cache."""
+        path = cls._marker_path(job.job_id)
+        try:
+            if job.status == 'done':
+                os.remove(path)
+            else:
+                temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+                with open(temp_path, 'wb') as f:
+                    f.write(cls._marker_body(job))
+                os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f'Could not update the marker of report job {job.job_id}: {e}')
+
+
+    @classmethod
+    def _heartbeat(cls, job_id: str, chunks):
+        """``chunks``, refreshing the job's marker at least once a minute."""
+        path = cls._marker_path(job_id)
+        touched = time.monotonic()
+        for chunk in chunks:
+            if time.monotonic() - touched > 60:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                touched = time.monotonic()
+            yield chunk
+
+
+    @staticmethod
+    def _describe(job: _Job) -> dict:
+        return {
+            'jobId': job.job_id,
+            'reportType': job.report_type,
+            'format': job.report_format,
+            'status': job.status,
+            'submitted': job.submitted,
+            'finished': job.finished,
+            'rows': job.rows,
+            'bytes': None,
+            'error': job.error,
+            'downloadUrl': None,
+        }
+
+
+    @classmethod
+    def _describe_marker(cls, job_id: str, marker: dict) -> dict:
+        """A job claimed by another worker process, as its marker records it."""
+        report_type, report_format = cls._parse(job_id)
+        return {
+            'jobId': job_id, 'reportType': report_type, 'format': report_format, 'status': marker['status'],
+            'submitted': datetime.fromisoformat(marker['submitted']),
+            'finished': datetime.fromisoformat(marker['finished']) if marker.get('finished') else None,
+            'rows': None, 'bytes': None, 'error': marker.get('error'), 'downloadUrl': None,
+        }
+
+
+    @classmethod
+    def _describe_done(cls, job_id: str, job: _Job | None) -> dict:
+        """A finished file, possibly built by another worker process."""
+        report_type, report_format = cls._parse(job_id)
+        described = cls._describe(job) if job is not None else {
+            'jobId': job_id, 'reportType': report_type, 'format': report_format, 'status': 'done',
+            'submitted': None, 'finished': None, 'rows': None, 'bytes': None, 'error': None, 'downloadUrl': None,
+        }
+        described.update(status='done', bytes=cls.cache.size(job_id), downloadUrl=DOWNLOAD_PATH.format(job_id=job_id))
+        return described
+
+
+    @staticmethod
+    def _not_found(job_id: str, job: _Job | None):
+        if job is not None:
+            raise HTTPException(status_code=404, detail=f'Report job {job_id} has expired. Please submit it again.')
+        raise HTTPException(status_code=404, detail=f'Unknown report job: {job_id}')
+
+
+    @classmethod
+    def status(cls, job_id: str) -> dict:
+        cls._parse(job_id)
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is not None and job.status != 'done':
+                return cls._describe(job)
+        if cls.cache.contains(job_id):
+            return cls._describe_done(job_id, job)
+        marker = cls._marker(job_id)
+        if marker is not None:
+            return cls._describe_marker(job_id, marker)
+        cls._not_found(job_id, job)
+
+
+    @classmethod
+    def download(cls, job_id: str) -> StreamingResponse:
+        report_type, report_format = cls._parse(job_id)
+        f = cls.cache.open(job_id)
+        if f is None:
+            with cls._lock:
+                job = cls._jobs.get(job_id)
+            if job is not None and job.status == 'failed':
+                raise HTTPException(status_code=job.status_code or 500, detail=job.error)
+            if job is not None and job.status != 'done':
+                raise HTTPException(status_code=409, detail=f'Report job {job_id} is still {job.status}.')
+            marker = cls._marker(job_id) if job is None else None
+            if marker is not None and marker['status'] == 'failed':
+                raise HTTPException(status_code=marker.get('statusCode') or 500, detail=marker.get('error'))
+            if marker is not None:
+                raise HTTPException(status_code=409, detail=f'Report job {job_id} is still {marker["status"]}.')
+            cls._not_found(job_id, job)
+
+        media_type, _ = alerts.REPORT_FORMATS[report_format]
+        headers = alerts.report_headers(report_type, report_format)
+        headers['Content-Length'] = str(os.fstat(f.fileno()).st_size) #type:ignore
+        return StreamingResponse(cls._read(f), media_type=media_type, headers=headers)
+
+
+    @staticmethod
+    def _read(f):
+        with f:
+            while chunk := f.read(READ_CHUNK):
+                yield chunk
+
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            return {
+                'workers': cls.workers,
+                'queue': cls.queue,
+                'active': cls._active,
+                'tracked': len(cls._jobs),
+                'avgSeconds': round(cls.avg_seconds, 4),
+                'cache': cls.cache.stats(),
+            }
@@ -1,7 +1,27 @@
+import numpy as np
 import pandas as pd
-from backend.app.utils.alerts_utils import al_utils
+from backend.app.utils.alerts_utils import al_utils, ATTENDANCE_BINS, TIER_LABELS
+from backend.app.utils.result_cache import ResultCache
+from backend.app.config import get_summary_report_cache_mb
+
+
+# Detailed report text for each attendance band, lowest band first.
+BAND_RISK_FACTORS = [
+    'Chronic absenteeism (Tier 4)',
+    'At risk of chronic absenteeism (Tier 3)',
+    'Moderate attendance concerns (Tier 2)',
+    'Good attendance (Tier 1)',
+]
+BAND_RECOMMENDATIONS = [
+    'Intensive intervention required|Family engagement specialist referral|Personalized attendance plan',
+    'Early intervention required|Attendance improvement plan',
+    'Individualized prevention strategies|Regular attendance monitoring',
+    'Continue current practices',
+]
 
 class ReportService:
+    # Summary report frames per normalized filter and dataset version.
+    summary_cache = ResultCache('summary_report', max_bytes=int(get_summary_report_cache_mb() * 1024 * 1024))
 
     @classmethod
     def generate_summary_report(cls, df: pd.DataFrame) -> pd.DataFrame:
@@ -15,32 +35,24 @@ class ReportService:
         if 'RISK_SCORE' not in df.columns:
             df['RISK_SCORE'] = 100 - df['Predicted_Attendance']
         
-        summary = df.groupby(group_cols).agg({
-            'STUDENT_ID': 'count', 
-            'Predicted_Attendance': ['mean', 'min', 'max', 'std'], 
-            'RISK_SCORE': ['mean', 'min', 'max']
+        # One pass yields every statistic and all four tier counts; the tier
+        # flags are summed alongside the other columns instead of regrouping.
+        columns = df[group_cols + ['STUDENT_ID', 'Predicted_Attendance', 'RISK_SCORE']]
+        columns = columns.assign(**{f'{tier} Count': df['TIER'] == tier for tier in TIER_LABELS})
+        summary = columns.groupby(group_cols, observed=True).agg(**{
+            'Total Students': ('STUDENT_ID', 'count'),
+            'Avg Attendance %': ('Predicted_Attendance', 'mean'),
+            'Min Attendance %': ('Predicted_Attendance', 'min'),
+            'Max Attendance %': ('Predicted_Attendance', 'max'),
+            'Std Dev Attendance': ('Predicted_Attendance', 'std'),
+            'Avg Risk Score': ('RISK_SCORE', 'mean'),
+            'Min Risk Score': ('RISK_SCORE', 'min'),
+            'Max Risk Score': ('RISK_SCORE', 'max'),
+            **{f'{tier} Count': (f'{tier} Count', 'sum') for tier in TIER_LABELS},
         }).reset_index()
         
-        summary.columns = [' '.join(col).strip() for col in summary.columns.values]
-        
-        tiers = ['Tier 4', 'Tier 3', 'Tier 2', 'Tier 1']
-        for tier in tiers:
-            tier_counts = df.groupby(group_cols)['TIER'].apply(lambda x: (x == tier).sum()).reset_index(name=f'{tier} Count')
-            summary = pd.merge(summary, tier_counts, on=group_cols)
-        
-        for tier in tiers:
-            summary[f'{tier} %'] = (summary[f'{tier} Count'] / summary['STUDENT_ID count'] * 100).round(2)
-        
-        summary.rename(columns={
-            'STUDENT_ID count': 'Total Students', 
-            'Predicted_Attendance mean': 'Avg Attendance %', 
-            'Predicted_Attendance min': 'Min Attendance %', 
-            'Predicted_Attendance max': 'Max Attendance %', 
-            'Predicted_Attendance std': 'Std Dev Attendance', 
-            'RISK_SCORE mean': 'Avg Risk Score', 
-            'RISK_SCORE min': 'Min Risk Score', 
-            'RISK_SCORE max': 'Max Risk Score'
-        }, inplace=True)
+        for tier in TIER_LABELS:
+            summary[f'{tier} %'] = (summary[f'{tier} Count'] / summary['Total Students'] * 100).round(2)
         
         return summary
     
@@ -56,37 +68,13 @@ class ReportService:
             report_df['RISK_SCORE'] = 100 - report_df['Predicted_Attendance']
         
         if 'RISK_LEVEL' not in report_df.columns:
-            report_df['RISK_LEVEL'] = report_df['Predicted_Attendance'].apply(al_utils.assign_risk_level)
-        
-        risk_factors = []
-        recommendations = []
-        insights = []
+            report_df['RISK_LEVEL'] = al_utils.classify_risk_levels(report_df['Predicted_Attendance'])
         
-        for _, row in report_df.iterrows():
-            student_risk_factors = []
-            student_recommendations = []
-            attendance = row['Predicted_Attendance']
-            
-            if attendance < 80:
-                student_risk_factors.append('Chronic absenteeism (Tier 4)')
-                student_recommendations.append('Intensive intervention required')
-                student_recommendations.append('Family engagement specialist referral')
-                student_recommendations.append('Personalized attendance plan')
-            elif attendance < 90:
-                student_risk_factors.append('At risk of chronic absenteeism (Tier 3)')
-                student_recommendations.append('Early intervention required')
-                student_recommendations.append('Attendance improvement plan')
-            elif attendance < 95:
-                student_risk_factors.append('Moderate attendance concerns (Tier 2)')
-                student_recommendations.append('Individualized prevention strategies')
-                student_recommendations.append('Regular attendance monitoring')
-            else:
-                student_risk_factors.append('Good attendance (Tier 1)')
-                student_recommendations.append('Continue current practices')
-            
-
-            risk_factors.append('|'.join(student_risk_factors) if student_risk_factors else 'None')
-            recommendations.append('|'.join(student_recommendations) if student_recommendations else 'Continue monitoring')
+        # NaN attendance fails every "<" test, so it gets the Tier 1 band, the
+        # same place np.digitize puts it.
+        bands = np.digitize(report_df['Predicted_Attendance'].to_numpy(dtype=float), ATTENDANCE_BINS)
+        risk_factors = pd.Categorical.from_codes(bands, categories=BAND_RISK_FACTORS)
+        recommendations = pd.Categorical.from_codes(bands, categories=BAND_RECOMMENDATIONS)
         
 
         report_df['Risk Factors'] = risk_factors
@@ -0,0 +1,116 @@
+import itertools
+import pandas as pd
+
+from backend.app.services.filter_service import FilterService
+from backend.app.utils.alerts_utils import al_utils
+from backend.app.utils.logger import logger
+from backend.classes.FilterCriteria import FilterCriteria
+from backend.classes.SummaryStatistics import SummaryStatistics
+
+
+# Filter dimensions in the order they appear in a summary key.
+KEY_COLUMNS = ['DISTRICT_CODE', 'LOCATION_ID', 'STUDENT_GRADE_LEVEL']
+
+
+class SummaryService:
+
+    @staticmethod
+    def attendance(df: pd.DataFrame) -> pd.Series | None:
+        if 'Predictions' in df.columns:
+            return df['Predictions'] * 100
+        if 'Predicted_Attendance' in df.columns:
+            return df['Predicted_Attendance']
+        return None
+
+
+    @classmethod
+    def summarize(cls, df: pd.DataFrame) -> SummaryStatistics:
+        total_students = len(df)
+        attendance_series = cls.attendance(df)
+        tier_counts = al_utils.classify_tiers(attendance_series).value_counts()
+        tier4, tier3, tier2, tier1 = int(tier_counts.get('Tier 4', 0)), int(tier_counts.get('Tier 3', 0)), int(tier_counts.get('Tier 2', 0)), int(tier_counts.get('Tier 1', 0))
+        below_85_students = int((attendance_series < 85).sum())
+
+        school_prediction = round(df['Predictions_School'].mean() * 100, 1) if 'Predictions_School' in df.columns and not df['Predictions_School'].isna().all() else None
+        grade_prediction = round(df['Predictions_Grade'].mean() * 100, 1) if 'Predictions_Grade' in df.columns and not df['Predictions_Grade'].isna().all() else None
+
+        return cls._statistics(total_students, below_85_students, tier4, tier3, tier2, tier1, school_prediction, grade_prediction)
+
+
+    @staticmethod
+    def _statistics(total_students, below_85_students, tier4, tier3, tier2, tier1, school_prediction, grade_prediction) -> SummaryStatistics:
+        return SummaryStatistics(
+            totalStudents=total_students, below85Students=below_85_students,
+            below85Percentage=below_85_students / total_students * 100 if total_students else 0.0,
+            tier4Students=tier4, tier4Percentage=tier4 / total_students * 100 if total_students else 0.0,
+            tier3Students=tier3, tier3Percentage=tier3 / total_students * 100 if total_students else 0.0,
+            tier2Students=tier2, tier2Percentage=tier2 / total_students * 100 if total_students else 0.0,
+            tier1Students=tier1, tier1Percentage=tier1 / total_students * 100 if total_students else 0.0,
+            schoolPrediction=school_prediction, gradePrediction=grade_prediction
+        )
+
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, year: int | None) -> dict:
+        """Summaries for every district/school/grade combination present in ``df``.
+
+        Keys are ``(district, school, grade)`` in the normalized form
+        ``FilterService`` compares against, with None for an unfiltered
+        dimension. Filtered combinations are restricted to school ``year``
+        the same way ``FilterService.filter_data`` is.
+        """
+        attendance_series = cls.attendance(df)
+        if attendance_series is None or any(col not in df.columns for col in KEY_COLUMNS):
+            return {}
+
+        tiers = al_utils.classify_tiers(attendance_series)
+        rows = pd.DataFrame({
+            'DISTRICT_CODE': df['DISTRICT_CODE'].astype(str).str.strip(),
+            'LOCATION_ID': df['LOCATION_ID'].astype(str).str.strip(),
+            'STUDENT_GRADE_LEVEL': df['STUDENT_GRADE_LEVEL'].apply(FilterService.normalize_grade),
+            'total': 1,
+            'below_85': (attendance_series < 85).astype(int),
+            'school_prediction': df['Predictions_School'] if 'Predictions_School' in df.columns else float('nan'),
+            'grade_prediction': df['Predictions_Grade'] if 'Predictions_Grade' in df.columns else float('nan'),
+        }, index=df.index)
+        for label in ['Tier 4', 'Tier 3', 'Tier 2', 'Tier 1']:
+            rows[label] = (tiers == label).astype(int)
+
+        if 'SCHOOL_YEAR' in df.columns:
+            rows = rows[df['SCHOOL_YEAR'].astype(str).str.strip() == str(year)]
+
+        aggregations = {
+            'total': 'sum', 'below_85': 'sum',
+            'Tier 4': 'sum', 'Tier 3': 'sum', 'Tier 2': 'sum', 'Tier 1': 'sum',
+            'school_prediction': 'mean', 'grade_prediction': 'mean',
+        }
+        summaries = {(None, None, None): cls.summarize(df)}
+        for size in range(1, len(KEY_COLUMNS) + 1):
+            for keys in itertools.combinations(KEY_COLUMNS, size):
+                grouped = rows.groupby(list(keys)).agg(aggregations)
+                for values, stats in grouped.iterrows():
+                    values = values if isinstance(values, tuple) else (values,)
+                    by_column = dict(zip(keys, values))
+                    key = tuple(by_column.get(col) for col in KEY_COLUMNS)
+                    summaries[key] = cls._statistics(
+                        int(stats['total']), int(stats['below_85']),
+                        int(stats['Tier 4']), int(stats['Tier 3']), int(stats['Tier 2']), int(stats['Tier 1']),
+                        round(stats['school_prediction'] * 100, 1) if pd.notna(stats['school_prediction']) else None,
+                        round(stats['grade_prediction'] * 100, 1) if pd.notna(stats['grade_prediction']) else None,
+                    )
+
+        logger.info(f'Precomputed summary statistics for {len(summaries)} filter combinations')
+        return summaries
+
+
+    @staticmethod
+    def key(criteria: FilterCriteria) -> tuple:
+        district = FilterService.normalize_district_code(criteria.districtCode) if criteria.districtCode else None
+        school = str(criteria.schoolCode).strip() if criteria.schoolCode else None
+        grade = FilterService.normalize_grade_code(criteria.gradeCode) if criteria.gradeCode else None
+        return district, school, grade
+
+
+    @classmethod
+    def lookup(cls, summaries: dict, criteria: FilterCriteria) -> SummaryStatistics | None:
+        return summaries.get(cls.key(criteria))
@@ -1,25 +1,49 @@
+import numpy as np
+import pandas as pd
+
+
+# Attendance cut points (percent), lowest band first. A value equal to a cut
+# point belongs to the band above it; missing attendance falls in the lowest.
+ATTENDANCE_BINS = [80, 90, 95]
+TIER_LABELS = ['Tier 4', 'Tier 3', 'Tier 2', 'Tier 1']
+RISK_LEVEL_LABELS = ['Critical', 'High', 'Medium', 'Low']
+
+
 class AlertsUtils:
+    def __init__(self, bins: list[float] = ATTENDANCE_BINS) -> None:
+        self.bins = list(bins)
+
+
+    def _band(self, attendance: float | int) -> int:
+        band = 0
+        for i, threshold in enumerate(self.bins):
+            if attendance >= threshold:
+                band = i + 1
+        return band
+
+
     def assign_tiers(self, attendance_percentage: float | int) -> str:
-        if attendance_percentage >= 95:
-            return 'Tier 1'
-        elif attendance_percentage >= 90:
-            return 'Tier 2'
-        elif attendance_percentage >= 80:
-            return 'Tier 3'
-        else:
-            return 'Tier 4'
-        
-    
+        return TIER_LABELS[self._band(attendance_percentage)]
+
+
     def assign_risk_level(self, attendance: float | int) -> str:
-        if attendance >= 95:
-            return 'Low'
-        elif attendance >= 90:
-            return 'Medium'
-        elif attendance >= 80:
-            return 'High'
-        else:
-            return 'Critical'
-        
-
-
-al_utils = AlertsUtils()
\ No newline at end of file
+        return RISK_LEVEL_LABELS[self._band(attendance)]
+
+
+    def classify(self, attendance: pd.Series, labels: list[str]) -> pd.Series:
+        values = attendance.to_numpy(dtype=float)
+        codes = np.digitize(values, self.bins)
+        codes[np.isnan(values)] = 0
+        return pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True), index=attendance.index, name=attendance.name)
+
+
+    def classify_tiers(self, attendance: pd.Series) -> pd.Series:
+        return self.classify(attendance, TIER_LABELS)
+
+
+    def classify_risk_levels(self, attendance: pd.Series) -> pd.Series:
+        return self.classify(attendance, RISK_LEVEL_LABELS)
+
+
+
+al_utils = AlertsUtils()
@@ -0,0 +1,87 @@
+import pandas as pd
+
+
+# Columns the insight and recommendation rules read; everything else in the
+# filtered frame is dropped before their row masks are applied.
+FRAME_COLUMNS = [
+    'DISTRICT_NAME', 'SCHOOL_NAME', 'STUDENT_GRADE_LEVEL',
+    'Predicted_Attendance', 'Predictions', 'Prediction_Probability',
+    'TIER', 'RISK_LEVEL', 'RISK_SCORE', 'LAST_ABSENCE_DATE',
+    'Total_Days_Present', 'Total_Days_Enrolled', 'Total_Days_Unexcused_Absent',
+]
+
+
+class AttendanceAggregates:
+    """Group statistics shared by the insight and recommendation generators.
+
+    Built once per filtered frame. ``frame`` is the narrowed copy the rules
+    run their row masks on, with the derived rate columns already added, and
+    each grouping is a single ``groupby`` carrying every column either
+    generator needs from it.
+    """
+
+    QUANTILES = [0.25, 0.5, 0.6, 0.75, 0.8]
+
+    def __init__(self, df: pd.DataFrame):
+        df = df[[col for col in FRAME_COLUMNS if col in df.columns]].copy()
+        self.frame = df
+
+        if 'Predicted_Attendance' not in df.columns:
+            df['Predicted_Attendance'] = df['Total_Days_Present'] / df['Total_Days_Enrolled'] * 100
+
+        self.total_students = len(df)
+        attendance = df['Predicted_Attendance']
+        self.attendance_mean = attendance.mean()
+        self.attendance_std = attendance.std()
+        self.attendance_quantiles = attendance.quantile(self.QUANTILES)
+
+        if 'Total_Days_Unexcused_Absent' in df.columns and 'Total_Days_Enrolled' in df.columns:
+            df['UNEXCUSED_ABSENT_RATE'] = df['Total_Days_Unexcused_Absent'] / df['Total_Days_Enrolled'] * 100
+            self.unexcused_quantiles = df['UNEXCUSED_ABSENT_RATE'].quantile([0.7, 0.9])
+
+        if 'Total_Days_Present' in df.columns and 'Total_Days_Enrolled' in df.columns:
+            df['Attendance_Rate'] = df['Total_Days_Present'] / df['Total_Days_Enrolled'] * 100
+            if 'Total_Days_Unexcused_Absent' in df.columns:
+                df['Total_Days_Absent'] = df['Total_Days_Enrolled'] - df['Total_Days_Present']
+                df['Total_Days_Excused_Absent'] = df['Total_Days_Absent'] - df['Total_Days_Unexcused_Absent']
+                df['Excused_Rate'] = df['Total_Days_Excused_Absent'] / df['Total_Days_Enrolled'] * 100
+
+        critical = (df['RISK_LEVEL'] == 'Critical') if 'RISK_LEVEL' in df.columns else pd.Series(False, index=df.index)
+        rows = df.assign(_critical=critical.astype(float))
+
+        self.risk_counts = df['RISK_LEVEL'].value_counts() if 'RISK_LEVEL' in df.columns else pd.Series(dtype=int)
+
+        if 'TIER' in df.columns:
+            by_tier = rows.groupby('TIER', observed=True).agg(
+                count=('TIER', 'size'),
+                avg_attendance=('Predicted_Attendance', 'mean'),
+            )
+            self.tier_counts = by_tier['count']
+            self.tier_attendance = by_tier['avg_attendance']
+
+        if 'STUDENT_GRADE_LEVEL' in df.columns:
+            by_grade = rows.groupby('STUDENT_GRADE_LEVEL').agg(
+                avg_attendance=('Predicted_Attendance', 'mean'),
+                attendance_std=('Predicted_Attendance', 'std'),
+                attendance_count=('Predicted_Attendance', 'count'),
+                student_count=('STUDENT_GRADE_LEVEL', 'size'),
+                critical_risk_pct=('_critical', 'mean'),
+            )
+            by_grade['critical_risk_pct'] = by_grade['critical_risk_pct'] * 100
+            self.by_grade = by_grade
+
+        if 'SCHOOL_NAME' in df.columns and 'DISTRICT_NAME' in df.columns and 'STUDENT_GRADE_LEVEL' in df.columns:
+            by_school = rows.groupby(['DISTRICT_NAME', 'SCHOOL_NAME'], observed=True).agg(
+                critical_risk_pct=('_critical', 'mean'),
+                avg_attendance=('Predicted_Attendance', 'mean'),
+                student_count=('STUDENT_GRADE_LEVEL', 'count'),
+            )
+            by_school['critical_risk_pct'] = by_school['critical_risk_pct'] * 100
+            self.by_school = by_school
+
+        if 'Total_Days_Enrolled' in df.columns and 'Total_Days_Present' in df.columns:
+            self.by_enrollment = rows.groupby('Total_Days_Enrolled').agg(
+                avg_attendance=('Predicted_Attendance', 'mean'),
+                avg_present=('Total_Days_Present', 'mean'),
+                student_count=('Total_Days_Enrolled', 'size'),
+            )
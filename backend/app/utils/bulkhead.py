@@ -0,0 +1,155 @@
+import asyncio
+import functools
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.app.config import get_bulkhead_limits
+from backend.app.utils.logger import logger
+
+
+class Bulkhead:
+    """A dedicated thread pool with a bounded queue for one class of endpoint.
+
+    Requests beyond ``workers`` running plus ``queue`` waiting are refused at
+    once with 429 and a Retry-After estimated from recent service times, so a
+    burst of heavy work cannot hold threads the other classes need.
+    """
+
+    def __init__(self, name: str, workers: int, queue: int, expected_seconds: float = 1.0):
+        self.name = name
+        self.workers, self.queue = get_bulkhead_limits(name, workers, queue)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=f'{name}-worker')
+        # Only read and written on the event loop thread.
+        self.pending = 0
+        self.rejected = 0
+        self.completed = 0
+        # Seeds the Retry-After estimate until real service times come in.
+        self.avg_seconds = expected_seconds
+
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.avg_seconds * self.pending / self.workers))
+
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * elapsed
+
+
+    def _finished(self, _future):
+        self.pending -= 1
+        self.completed += 1
+
+
+    def _admit(self):
+        if self.pending >= self.workers + self.queue:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(f'{self.name} bulkhead full ({self.pending} pending), rejecting request, retry after {retry_after}s')
+            raise HTTPException(
+                status_code=429,
+                detail=f'Too many {self.name} requests in progress. Please try again shortly.',
+                headers={'Retry-After': str(retry_after)},
+            )
+        self.pending += 1
+
+
+    async def run(self, fn, *args, **kwargs):
+        self._admit()
+        future = asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(self._timed, fn, *args, **kwargs))
+        # Released when the work ends, not when the caller stops waiting on it.
+        future.add_done_callback(self._finished)
+        return await asyncio.shield(future)
+
+
+    async def stream(self, fn, *args, **kwargs):
+        """``run`` for ``fn`` returning a ``BlockingStreamingResponse``.
+
+        The slot is handed on to the response instead of being released when
+        ``fn`` returns, so the service time includes the streaming.
+        """
+        self._admit()
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        try:
+            response = await asyncio.shield(future)
+        except BaseException:
+            future.add_done_callback(lambda _future: self._streamed(started))
+            raise
+        if isinstance(response, BlockingStreamingResponse):
+            response.bulkhead, response.started = self, started
+        else:
+            self._streamed(started)
+        return response
+
+
+    def _streamed(self, started: float):
+        self.avg_seconds = 0.8 * self.avg_seconds + 0.2 * (time.perf_counter() - started)
+        self._finished(None)
+
+
+    def stats(self) -> dict:
+        return {
+            'workers': self.workers,
+            'queue': self.queue,
+            'pending': self.pending,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'avgSeconds': round(self.avg_seconds, 4),
+        }
+
+
+
+class BlockingStreamingResponse(StreamingResponse):
+    """A ``StreamingResponse`` over a blocking chunk iterator.
+
+    Starlette pulls a plain iterator in its shared threadpool. This one is
+    pulled on the threads of the bulkhead whose ``stream`` returned it, and
+    the slot taken for the request is released when the response is done
+    with, however that ends: the body exhausted or failing, or the client
+    gone before the body was ever started.
+    """
+
+    _DONE = object()
+
+    def __init__(self, chunks: Iterable[bytes], **kwargs):
+        super().__init__(self._pull(), **kwargs)
+        self.chunks = iter(chunks)
+        self.bulkhead: Bulkhead | None = None
+        self.started = 0.0
+
+
+    async def _pull(self):
+        loop = asyncio.get_running_loop()
+        executor = self.bulkhead.executor if self.bulkhead is not None else None
+        while True:
+            chunk = await loop.run_in_executor(executor, next, self.chunks, self._DONE)
+            if chunk is self._DONE:
+                break
+            yield chunk
+
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            bulkhead, self.bulkhead = self.bulkhead, None
+            if bulkhead is not None:
+                bulkhead._streamed(self.started)
+
+
+
+bulkheads = {
+    'reports': Bulkhead('reports', workers=2, queue=4, expected_seconds=5.0),
+    'analysis': Bulkhead('analysis', workers=4, queue=16, expected_seconds=0.5),
+    'lookups': Bulkhead('lookups', workers=8, queue=64, expected_seconds=0.05),
+}
@@ -0,0 +1,100 @@
+from typing import Callable, Iterator
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+
+# Rows converted to Arrow per step; each step's encoded bytes are yielded
+# before the next one is built. For Parquet each step is one row group.
+CHUNK_ROWS = 100_000
+# Reports are mostly repeated labels and small numbers, which zstd packs far
+# smaller than the default codecs for about the same time.
+COMPRESSION = 'zstd' if pa.Codec.is_available('zstd') else None
+
+
+class _Sink:
+    """Write-only file for Arrow writers; ``drain`` hands back what came in."""
+
+    closed = False
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.position = 0
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self.parts)
+        self.parts.clear()
+        return data
+
+
+def _arrow_schema(df: pd.DataFrame) -> tuple[pa.Schema, list]:
+    """Schema for the whole frame, so every chunk converts to the same types.
+
+    Object columns Arrow cannot type on their own, such as ones mixing
+    numbers and strings, are written as strings; they are returned so each
+    chunk can be converted the same way.
+    """
+    try:
+        return pa.Schema.from_pandas(df, preserve_index=False), []
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        mixed = []
+        for name in df.columns:
+            try:
+                pa.Schema.from_pandas(df[[name]], preserve_index=False)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                mixed.append(name)
+        return pa.Schema.from_pandas(_as_strings(df, mixed), preserve_index=False), mixed
+
+
+def _as_strings(df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    if not columns:
+        return df
+    df = df.copy(deep=False)
+    for name in columns:
+        df[name] = df[name].map(lambda value: None if pd.isna(value) else str(value))
+    return df
+
+
+def _stream(df: pd.DataFrame, open_writer: Callable, chunk_rows: int) -> Iterator[bytes]:
+    if not all(isinstance(name, str) for name in df.columns):
+        # Arrow field names are strings; match them so chunks line up with the schema.
+        df = df.copy(deep=False)
+        df.columns = [str(name) for name in df.columns]
+    schema, mixed = _arrow_schema(df)
+    sink = _Sink()
+    writer = open_writer(sink, schema)
+    for start in range(0, len(df), chunk_rows):
+        chunk = _as_strings(df.iloc[start:start + chunk_rows], mixed)
+        writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def stream_csv(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield ``df`` as UTF-8 CSV with a header row and no index."""
+    return _stream(df, pa_csv.CSVWriter, chunk_rows)
+
+
+def stream_parquet(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield ``df`` as a Parquet file, one row group per chunk."""
+    return _stream(df, lambda sink, schema: pq.ParquetWriter(sink, schema, compression=COMPRESSION or 'none'), chunk_rows)
+
+
+def stream_arrow(df: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield ``df`` as an Arrow IPC file, which ``pd.read_feather`` also reads."""
+    options = pa.ipc.IpcWriteOptions(compression=COMPRESSION)
+    return _stream(df, lambda sink, schema: pa.ipc.new_file(sink, schema, options=options), chunk_rows)
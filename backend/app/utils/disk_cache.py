@@ -0,0 +1,139 @@
+import os
+import re
+import threading
+from typing import BinaryIO, Iterable
+
+from backend.app.utils.logger import logger
+
+
+_KEY = re.compile(r'[A-Za-z0-9_-]+')
+
+
+class DiskCache:
+    """Directory of finished files bounded by total size, oldest use evicted first.
+
+    Files are written under a temporary name and renamed into place, so no
+    reader, in this process or another worker sharing the directory, sees a
+    partial file. A hit refreshes the file's mtime, which is what eviction
+    orders by.
+    """
+
+    def __init__(self, name: str, directory: str, max_bytes: int, suffix: str = ''):
+        self.name = name
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def path(self, key: str) -> str:
+        if not _KEY.fullmatch(key):
+            raise ValueError(f'Invalid {self.name} cache key: {key!r}')
+        return os.path.join(self.directory, key + self.suffix)
+
+
+    def contains(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+
+    def open(self, key: str) -> BinaryIO | None:
+        """The cached file opened for reading, or None on a miss.
+
+        The open handle stays readable even if the file is evicted meanwhile.
+        """
+        path = self.path(key)
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return f
+
+
+    def size(self, key: str) -> int | None:
+        try:
+            return os.path.getsize(self.path(key))
+        except FileNotFoundError:
+            return None
+
+
+    def put(self, key: str, chunks: Iterable[bytes]) -> int:
+        """Write ``chunks`` as the file for ``key`` and return its size."""
+        path = self.path(key)
+        temp_path = os.path.join(self.directory, f'.{key}.{os.getpid()}.{threading.get_ident()}.tmp')
+        size = 0
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(temp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    size += len(chunk)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        self._evict(keep=path)
+        return size
+
+
+    def _entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) of every finished file in the directory."""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith('.') or not entry.name.endswith(self.suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+
+    def _evict(self, keep: str):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except FileNotFoundError:
+                    pass
+                total -= size
+            if total > self.max_bytes:
+                logger.warning(f'{self.name} cache is over its {self.max_bytes} byte limit: the newest file alone is larger')
+
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(entries),
+                'bytes': sum(size for _, size, _ in entries),
+                'maxBytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+            }
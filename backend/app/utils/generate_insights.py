@@ -1,13 +1,13 @@
 import pandas as pd
 import numpy as np
+from backend.app.utils.attendance_aggregates import AttendanceAggregates
 from backend.classes.KeyInsight import KeyInsight
 
-def generate_ai_insights(df, shap_values=None, feature_names=None):
+def generate_ai_insights(df, shap_values=None, feature_names=None, aggregates=None):
     insights = []
     total_students = len(df)
-    
-    if 'Predicted_Attendance' not in df.columns:
-        df['Predicted_Attendance'] = df['Total_Days_Present'] / df['Total_Days_Enrolled'] * 100
+    aggregates = aggregates or AttendanceAggregates(df)
+    df = aggregates.frame
     
     # SHAP-based feature importance insights
     if shap_values is not None and feature_names is not None:
@@ -32,8 +32,8 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     
     # Enhanced tier analysis with SHAP insights
     if 'TIER' in df.columns:
-        tier_counts = df['TIER'].value_counts()
-        tier_attendance = df.groupby('TIER')['Predicted_Attendance'].mean()
+        tier_counts = aggregates.tier_counts
+        tier_attendance = aggregates.tier_attendance
         
         # Add SHAP-based tier risk assessment
         if shap_values is not None:
@@ -47,7 +47,7 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
                         tier_shap_scores[tier] = avg_shap_impact
         
         for tier in ['Tier 4', 'Tier 3', 'Tier 2', 'Tier 1']:
-            if tier in tier_counts.index:
+            if tier_counts.get(tier, 0) > 0:
                 count = tier_counts[tier]
                 pct = count / total_students * 100
                 avg_attendance = tier_attendance.get(tier, 0)
@@ -101,7 +101,7 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
             ))
             
             # SHAP-based early warning with feature explanations
-            current_good_performance = df['Predicted_Attendance'].quantile(0.6)
+            current_good_performance = aggregates.attendance_quantiles[0.6]
             early_warning = df[(df['Predicted_Attendance'] >= current_good_performance) & (df['Predictions'] == 1)]
             
             if len(early_warning) > 0:
@@ -122,10 +122,8 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     
     # Enhanced unexcused absence analysis with SHAP
     if 'Total_Days_Unexcused_Absent' in df.columns and 'Total_Days_Enrolled' in df.columns:
-        df['UNEXCUSED_ABSENT_RATE'] = df['Total_Days_Unexcused_Absent'] / df['Total_Days_Enrolled'] * 100
-        
-        severe_threshold = max(15, df['UNEXCUSED_ABSENT_RATE'].quantile(0.9))
-        moderate_threshold = max(5, df['UNEXCUSED_ABSENT_RATE'].quantile(0.7))
+        severe_threshold = max(15, aggregates.unexcused_quantiles[0.9])
+        moderate_threshold = max(5, aggregates.unexcused_quantiles[0.7])
         
         severe_cases = df[df['UNEXCUSED_ABSENT_RATE'] > severe_threshold]
         moderate_cases = df[df['UNEXCUSED_ABSENT_RATE'].between(moderate_threshold, severe_threshold)]
@@ -145,8 +143,7 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
             ))
     
     # SHAP-enhanced chronic absence analysis
-    attendance_distribution = df['Predicted_Attendance'].describe()
-    chronic_threshold = min(80, attendance_distribution['25%'])
+    chronic_threshold = min(80, aggregates.attendance_quantiles[0.25])
     
     chronic_students = df[df['Predicted_Attendance'] < chronic_threshold]
     if len(chronic_students) > 0:
@@ -169,10 +166,7 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     
     # SHAP-enhanced grade-level analysis
     if 'STUDENT_GRADE_LEVEL' in df.columns:
-        grade_analysis = df.groupby('STUDENT_GRADE_LEVEL').agg({
-            'Predicted_Attendance': ['mean', 'std', 'count'],
-            'RISK_LEVEL': lambda x: (x == 'Critical').mean() * 100 if 'RISK_LEVEL' in df.columns else 0
-        }).round(2)
+        grade_analysis = aggregates.by_grade[['avg_attendance', 'attendance_std', 'attendance_count', 'critical_risk_pct']].round(2)
         
         grade_analysis.columns = ['avg_attendance', 'attendance_std', 'student_count', 'critical_risk_pct']
         
@@ -300,7 +294,7 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     # NEW: SHAP-based success factor identification
     if shap_values is not None and feature_names is not None:
         # Identify features that consistently contribute to positive outcomes
-        high_performers = df[df['Predicted_Attendance'] > df['Predicted_Attendance'].quantile(0.8)]
+        high_performers = df[df['Predicted_Attendance'] > aggregates.attendance_quantiles[0.8]]
         
         if len(high_performers) > 0:
             high_performer_indices = high_performers.index
@@ -385,9 +379,6 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     
     # NEW: Attendance trend analysis
     if 'Total_Days_Present' in df.columns and 'Total_Days_Enrolled' in df.columns:
-        # Calculate attendance rate for better analysis
-        df['Attendance_Rate'] = df['Total_Days_Present'] / df['Total_Days_Enrolled'] * 100
-        
         # Identify students with extremely low attendance (less than 10%)
         extremely_low = df[df['Attendance_Rate'] < 10]
         if len(extremely_low) > 0:
@@ -406,18 +397,15 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
             ))
     
     # NEW: Enrollment vs attendance correlation
-    if 'Total_Days_Enrolled' in df.columns:
-        enrollment_analysis = df.groupby('Total_Days_Enrolled').agg({
-            'Predicted_Attendance': 'mean',
-            'Total_Days_Present': 'mean'
-        }).round(2)
+    if 'Total_Days_Enrolled' in df.columns and 'Total_Days_Present' in df.columns:
+        enrollment_analysis = aggregates.by_enrollment.round({'avg_attendance': 2, 'avg_present': 2})
         
         # Find enrollment periods with lowest attendance
         if len(enrollment_analysis) > 1:
-            lowest_attendance_period = enrollment_analysis['Predicted_Attendance'].idxmin()
-            lowest_attendance_rate = enrollment_analysis.loc[lowest_attendance_period, 'Predicted_Attendance']
+            lowest_attendance_period = enrollment_analysis['avg_attendance'].idxmin()
+            lowest_attendance_rate = enrollment_analysis.loc[lowest_attendance_period, 'avg_attendance']
             
-            students_in_period = len(df[df['Total_Days_Enrolled'] == lowest_attendance_period])
+            students_in_period = int(enrollment_analysis.loc[lowest_attendance_period, 'student_count'])
             
             insights.append(KeyInsight(
                 insight=f'ENROLLMENT IMPACT: Students enrolled for {lowest_attendance_period} days show lowest attendance ({lowest_attendance_rate:.1f}%) - {students_in_period} students affected, review mid-year enrollment support'
@@ -425,7 +413,7 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     
     # NEW: Attendance distribution analysis
     if 'Predicted_Attendance' in df.columns:
-        attendance_quartiles = df['Predicted_Attendance'].quantile([0.25, 0.5, 0.75]).round(1)
+        attendance_quartiles = aggregates.attendance_quantiles[[0.25, 0.5, 0.75]].round(1)
         
         # Identify the attendance gaps
         q1_to_q2_gap = attendance_quartiles[0.5] - attendance_quartiles[0.25]
@@ -450,10 +438,6 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     if 'Total_Days_Unexcused_Absent' in df.columns and 'Total_Days_Enrolled' in df.columns:
         # Calculate excused absences
         if 'Total_Days_Present' in df.columns:
-            df['Total_Days_Absent'] = df['Total_Days_Enrolled'] - df['Total_Days_Present']
-            df['Total_Days_Excused_Absent'] = df['Total_Days_Absent'] - df['Total_Days_Unexcused_Absent']
-            df['Excused_Rate'] = df['Total_Days_Excused_Absent'] / df['Total_Days_Enrolled'] * 100
-            
             # Students with high excused absences (might indicate health/family issues)
             high_excused = df[df['Excused_Rate'] > 15]
             if len(high_excused) > 0:
@@ -495,8 +479,8 @@ def generate_ai_insights(df, shap_values=None, feature_names=None):
     
     # NEW: School-wide attendance health score
     if 'Predicted_Attendance' in df.columns:
-        school_avg_attendance = df['Predicted_Attendance'].mean()
-        attendance_std = df['Predicted_Attendance'].std()
+        school_avg_attendance = aggregates.attendance_mean
+        attendance_std = aggregates.attendance_std
         
         # Calculate consistency score
         consistency_score = 100 - (attendance_std / school_avg_attendance * 100)
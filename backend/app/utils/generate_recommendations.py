@@ -1,12 +1,12 @@
 import pandas as pd
 import numpy as np
+from backend.app.utils.attendance_aggregates import AttendanceAggregates
 from backend.classes.Recommendation import Recommendation
 
-def generate_ai_recommendations(df, shap_values=None, feature_names=None):
+def generate_ai_recommendations(df, shap_values=None, feature_names=None, aggregates=None):
     recommendations = []
-    
-    if 'Predicted_Attendance' not in df.columns:
-        df['Predicted_Attendance'] = df['Total_Days_Present'] / df['Total_Days_Enrolled'] * 100
+    aggregates = aggregates or AttendanceAggregates(df)
+    df = aggregates.frame
     
     # SHAP-based feature importance insights for recommendations
     if shap_values is not None and feature_names is not None:
@@ -138,7 +138,7 @@ def generate_ai_recommendations(df, shap_values=None, feature_names=None):
     
     # Risk-based recommendations enhanced with SHAP insights
     if 'RISK_LEVEL' in df.columns:
-        risk_counts = df['RISK_LEVEL'].value_counts()
+        risk_counts = aggregates.risk_counts
         total_students = len(df)
         
         critical = int(risk_counts.get('Critical', 0))
@@ -289,17 +289,13 @@ def generate_ai_recommendations(df, shap_values=None, feature_names=None):
                 break
     
     # SHAP-enhanced school resource allocation
-    if 'SCHOOL_NAME' in df.columns and 'DISTRICT_NAME' in df.columns:
-        school_metrics = df.groupby(['DISTRICT_NAME', 'SCHOOL_NAME']).agg({
-            'RISK_LEVEL': lambda x: (x == 'Critical').mean() * 100,
-            'Predicted_Attendance': 'mean',
-            'STUDENT_GRADE_LEVEL': 'count'
-        }).rename(columns={'STUDENT_GRADE_LEVEL': 'student_count'})
+    if 'SCHOOL_NAME' in df.columns and 'DISTRICT_NAME' in df.columns and 'STUDENT_GRADE_LEVEL' in df.columns:
+        school_metrics = aggregates.by_school.rename(columns={'critical_risk_pct': 'RISK_LEVEL', 'avg_attendance': 'Predicted_Attendance'})
         
         # Enhanced with SHAP-based risk scoring
         if shap_values is not None:
             school_shap_scores = {}
-            for (district, school), group in df.groupby(['DISTRICT_NAME', 'SCHOOL_NAME']):
+            for (district, school), group in df.groupby(['DISTRICT_NAME', 'SCHOOL_NAME'], observed=True):
                 if len(group) > 0:
                     school_indices = group.index
                     avg_shap_impact = np.abs(shap_values[school_indices]).mean()
@@ -337,11 +333,9 @@ def generate_ai_recommendations(df, shap_values=None, feature_names=None):
     
     # SHAP-enhanced grade-level strategies
     if 'STUDENT_GRADE_LEVEL' in df.columns:
-        grade_analysis = df.groupby('STUDENT_GRADE_LEVEL').agg({
-            'Predicted_Attendance': 'mean',
-            'RISK_LEVEL': lambda x: (x == 'Critical').mean() * 100,
-            'STUDENT_GRADE_LEVEL': 'count'
-        }).rename(columns={'STUDENT_GRADE_LEVEL': 'student_count'})
+        grade_analysis = aggregates.by_grade[['avg_attendance', 'critical_risk_pct', 'student_count']].rename(
+            columns={'avg_attendance': 'Predicted_Attendance', 'critical_risk_pct': 'RISK_LEVEL'}
+        )
         
         # Add SHAP-based grade risk assessment
         if shap_values is not None:
@@ -373,7 +367,7 @@ def generate_ai_recommendations(df, shap_values=None, feature_names=None):
     
     # SHAP-enhanced performance metrics
     if 'Predicted_Attendance' in df.columns:
-        current_avg = df['Predicted_Attendance'].mean()
+        current_avg = aggregates.attendance_mean
         
         # SHAP-based improvement potential
         if shap_values is not None:
@@ -1,28 +1,68 @@
 from backend.app.config import get_alerts_data_path, get_current_year
 from backend.app.utils.logger import logger
-from backend.app.data_store import data_store
+from backend.app.data_store import DataStore, data_store
 from backend.app.utils.model_file_utils import FileUtils
 from backend.app.utils.alerts_utils import al_utils
+from backend.app.utils.preprocessing import optimize_dtypes
+from backend.app.utils.snapshot_utils import SnapshotUtils
+from backend.app.utils.stage_timer import StageTimer
 from backend.app.services.ai_predictions import apply_ai_predictions_to_dataset
+from backend.app.services.summary_service import SummaryService
+from backend.app.services.filter_service import FilterService
 from backend.app.ml.risk_model import RiskModel
 from backend.app.ml.anomaly_detector import AnomalyDetector
 from backend.app.ml.cluster_model import ClusterModel
 
 import time
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import concurrent.futures
 from datetime import datetime
 
 
-CURRENT_SCHOOL_YEAR = get_current_year()
 RISK_MODEL = RiskModel()
 ANOMALY_DETECTOR = AnomalyDetector()
 CLUSTER_MODEL = ClusterModel()
 
-
-def load_data() -> pd.DataFrame:
+# Source columns read by the alerts pipeline, models, insights and reports.
+# Anything else in Alerts.parquet is never decoded.
+ALERTS_COLUMNS = [
+    'STUDENT_ID', 'SCHOOL_YEAR',
+    'DISTRICT_CODE', 'DISTRICT_NAME', 'LOCATION_ID', 'SCHOOL_CODE', 'SCHOOL_NAME',
+    'STUDENT_GRADE_LEVEL', 'GRADE_CODE', 'GRADE_LEVEL',
+    'Total_Days_Present', 'Total_Days_Enrolled', 'Total_Days_Unexcused_Absent',
+    'ATTENDANCE_RATE', 'Prior_Attendance_Rate', 'LAST_ABSENCE_DATE',
+    'Predictions', 'Predictions_School', 'Predictions_Grade', 'Prediction_Probability',
+    'ECONOMIC_CODE', 'SPECIAL_ED_CODE', 'ENG_PROF_CODE', 'HISPANIC_IND',
+]
+
+# DataStore attributes rebuilt alongside the frame and persisted with it.
+SNAPSHOT_FIELDS = [
+    'indices', 'ml_models', 'anomaly_detector', 'cluster_model', 'cluster_insights',
+    'feature_importance', 'anomaly_feature_columns', 'memory_report', 'summaries',
+    'filter_index', 'current_year',
+]
+
+
+def load_data(year: int | None) -> pd.DataFrame:
     try:
-        df = pd.read_parquet(get_alerts_data_path())
+        path = get_alerts_data_path()
+        schema = pq.read_schema(path)
+        columns = [col for col in ALERTS_COLUMNS if col in schema.names]
+
+        filters = None
+        if year is not None and 'SCHOOL_YEAR' in schema.names:
+            year_type = schema.field('SCHOOL_YEAR').type
+            value = str(year) if pa.types.is_string(year_type) or pa.types.is_large_string(year_type) else year
+            filters = [('SCHOOL_YEAR', '==', value)]
+
+        df = pd.read_parquet(path, engine='pyarrow', columns=columns, filters=filters)
+
+        if filters and len(df) == 0:
+            logger.warning(f'No rows for SCHOOL_YEAR {year} in {path}, reading all years')
+            df = pd.read_parquet(path, engine='pyarrow', columns=columns)
+
         return df
     except Exception as e:
         print(f'Failed to load Data: {e}')
@@ -30,34 +70,62 @@ def load_data() -> pd.DataFrame:
 
 
 
-def load_and_process():
+def load_and_process(store: DataStore = data_store, year: int | None = None):
+    """Build ``store`` from the alerts data for school ``year``.
+
+    ``year`` defaults to the current year of the published predictions; a
+    reload passes the one of the predictions it is about to publish.
+    """
+    if year is None:
+        year = get_current_year()
     file_utils = FileUtils()
+    snapshot_utils = SnapshotUtils()
+    timer = StageTimer('alerts')
     try:
-        data_store.loading = True
-        data_store.is_ready = False
-        data_store.load_error = ''
-        logger.info('Starting data loading and AI model training...')
+        store.loading = True
+        store.is_ready = False
+        store.models_ready = False
+        store.load_error = ''
         start_time = time.time()
 
-        df = load_data()
+        snapshot_utils.acquire('alerts')
+        restored = timer.timed('snapshot_restore', snapshot_utils.restore, 'alerts')
+        if restored is not None and not set(SNAPSHOT_FIELDS) <= set(restored[1]):
+            logger.info('alerts snapshot predates the current store layout, rebuilding')
+            restored = None
+        if restored is not None:
+            df, state = restored
+            for field, value in state.items():
+                setattr(store, field, value)
+            store.df = df
+            store.fingerprint = snapshot_utils.fingerprint('alerts')
+            store.last_loaded = datetime.now()
+            logger.info(f'Restored {len(store.df)} processed records from snapshot in {time.time() - start_time:.2f} seconds')
+            store.is_ready = True
+            store.models_ready = True
+            return
+
+        logger.info('Starting data loading and AI model training...')
+        df = timer.timed('load_data', load_data, year)
 
         if df is None or len(df) == 0:
-            data_store.load_error = 'Failed to load data'
-            data_store.loading = False
+            store.load_error = 'Failed to load data'
+            store.loading = False
             return
         
         logger.info(f'Available columns in DataFrame: {df.columns.tolist()}')
 
 
+        store.current_year = year
         if 'SCHOOL_YEAR' in df.columns:
             df['SCHOOL_YEAR'] = pd.to_numeric(df['SCHOOL_YEAR'], errors='coerce')
-            current_year_df = df[df['SCHOOL_YEAR'] == int(CURRENT_SCHOOL_YEAR)] #type:ignore
+            current_year_df = df[df['SCHOOL_YEAR'] == int(year)] #type:ignore
 
             if len(current_year_df) > 0:
                 df = current_year_df
-                logger.info(f'Filtered to {CURRENT_SCHOOL_YEAR} data: {len(df)} records')
+                logger.info(f'Filtered to {year} data: {len(df)} records')
             else:
-                logger.warning(f'No {CURRENT_SCHOOL_YEAR} data found, using all available data')
+                logger.warning(f'No {year} data found, using all available data')
 
 
         if 'STUDENT_ID' in df.columns:
@@ -72,58 +140,92 @@ def load_and_process():
             raise ValueError('Predictions column not found in data')
         
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            predictions_future = executor.submit(lambda: df['Predictions'].values)
-            predictions = predictions_future.result()
+        with timer.stage('derive_risk_tiers'):
+            predictions = df['Predictions'].values
             df['RISK_SCORE'] = 100 - predictions #type:ignore
             df['RISK_LEVEL'] = pd.cut(df['RISK_SCORE'], bins=[0, 20, 40, 60, 80, 100], labels=['Very Low', 'Low', 'Medium', 'High', 'Critical'])
             df['Predicted_Attendance'] = predictions
-            df['TIER'] = df['Predicted_Attendance'].apply(al_utils.assign_tiers)
-            train_ml_models_future = executor.submit(RISK_MODEL.train_ml_model, df)
-            train_anomaly_detector_future = executor.submit(ANOMALY_DETECTOR.train_anomaly_detector, df)
-            train_clustering_future = executor.submit(CLUSTER_MODEL.train_clustering, df)
-            data_store.ml_models = train_ml_models_future.result()
-            data_store.anomaly_detector = train_anomaly_detector_future.result()
-            data_store.cluster_model, data_store.cluster_insights = train_clustering_future.result() #type:ignore
+            df['TIER'] = al_utils.classify_tiers(df['Predicted_Attendance'])
+
+
+        with timer.stage('build_indices'):
+            store.indices = {'DISTRICT_NAME': df['DISTRICT_NAME'].str.upper().to_dict(), 'STUDENT_GRADE_LEVEL': df['STUDENT_GRADE_LEVEL'].astype(str).to_dict()}
 
+            if 'SCHOOL_NAME' in df.columns:
+                store.indices['SCHOOL_NAME'] = df['SCHOOL_NAME'].str.upper().to_dict()
 
-        data_store.indices = {'DISTRICT_NAME': df['DISTRICT_NAME'].str.upper().to_dict(), 'STUDENT_GRADE_LEVEL': df['STUDENT_GRADE_LEVEL'].astype(str).to_dict()}
+            layout = FilterService.layout_order(df)
 
 
-        if 'SCHOOL_NAME' in df.columns:
-            data_store.indices['SCHOOL_NAME'] = df['SCHOOL_NAME'].str.upper().to_dict()
+        store.summaries = timer.timed('build_summaries', SummaryService.build, df, year)
 
 
         if 'ATTENDANCE_RATE' not in df.columns and 'Total_Days_Present' in df.columns and 'Total_Days_Enrolled' in df.columns:
             df['ATTENDANCE_RATE'] = df['Total_Days_Present'] / df['Total_Days_Enrolled'] * 100
-            
 
-        apply_ai_predictions_to_dataset(df)
-        data_store.df = df #type:ignore
+
+        # The alerts endpoints only need the tiered frame, so serve a copy of it
+        # now; the models train on the original and replace it when done. Both
+        # are stored in layout order so filters resolve to slices of them.
+        served = df.take(layout)
+        store.filter_index = timer.timed('build_filter_index', FilterService.build_index, served, year)
+        timer.timed('optimize_served_dtypes', optimize_dtypes, served)
+        store.df = served
+        store.version += 1
+        store.last_loaded = datetime.now()
+        store.is_ready = True
+        logger.info(f'Alerts data ready in {time.time() - start_time:.2f} seconds, training models...')
+
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            train_ml_models_future = executor.submit(timer.timed, 'train_risk_model', RISK_MODEL.train_ml_model, df)
+            train_anomaly_detector_future = executor.submit(timer.timed, 'train_anomaly_detector', ANOMALY_DETECTOR.train_anomaly_detector, df)
+            train_clustering_future = executor.submit(timer.timed, 'train_clustering', CLUSTER_MODEL.train_clustering, df)
+            store.ml_models = train_ml_models_future.result()
+            store.anomaly_detector = train_anomaly_detector_future.result()
+            store.cluster_model, store.cluster_insights = train_clustering_future.result() #type:ignore
+            store.ml_models['cluster_model'] = store.cluster_model
+            store.anomaly_feature_columns = list(getattr(store.anomaly_detector, 'feature_names_in_', []))
+
+
+        timer.timed('apply_ai_predictions', apply_ai_predictions_to_dataset, df, store)
+        df = df.take(layout)
+        store.memory_report = timer.timed('optimize_dtypes', optimize_dtypes, df)
+        before = sum(col['before'] for col in store.memory_report.values())
+        after = sum(col['after'] for col in store.memory_report.values())
+        logger.info(f'Optimized column dtypes: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB')
+        store.df = df #type:ignore
+        store.version += 1
         
 
-        if 'risk_predictor' not in data_store.ml_models:
+        if 'risk_predictor' not in store.ml_models:
             logger.warning('Risk predictor model still not available after training. Checking for cached model...')
             model = file_utils.load_model('risk_predictor')
 
             if model:
-                data_store.ml_models['risk_predictor'] = model
+                store.ml_models['risk_predictor'] = model
                 logger.info('Successfully loaded risk predictor from cache')
             else:
                 logger.error('Failed to load risk predictor model from cache')
 
 
-        data_store.last_loaded = datetime.now()
+        store.last_loaded = datetime.now()
         processing_time = time.time() - start_time
         logger.info(f'Data processing and AI model training completed in {processing_time:.2f} seconds')
-        data_store.is_ready = True
+        store.models_ready = True
+        timer.timed('snapshot_save', snapshot_utils.save, 'alerts', df, {field: getattr(store, field) for field in SNAPSHOT_FIELDS})
+        # Taken after the save, when any models trained above are on disk, so
+        # it matches what other workers restoring this snapshot compute.
+        store.fingerprint = snapshot_utils.fingerprint('alerts')
 
 
     except Exception as e:
         logger.error(f'Error in data processing: {str(e)}')
-        data_store.load_error = str(e)
+        store.load_error = str(e)
 
         
     finally:
-        data_store.loading = False
+        snapshot_utils.release()
+        store.stage_timings = timer.log()
+        store.loading = False
         return df
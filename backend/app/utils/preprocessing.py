@@ -29,3 +29,44 @@ def split_features(df: pd.DataFrame, cols: list[str]):
         ]
     )
     return ColumnTransformer([("num", num_t, num), ("cat", cat_t, cat)])
+
+
+CATEGORICAL_COLUMNS = [
+    "DISTRICT_NAME",
+    "SCHOOL_NAME",
+    "TIER",
+    "RISK_LEVEL",
+    "AI_RISK_LEVEL",
+    "ECONOMIC_CODE",
+    "SPECIAL_ED_CODE",
+    "ENG_PROF_CODE",
+    "HISPANIC_IND",
+]
+DAY_COUNT_COLUMNS = ["Total_Days_Present", "Total_Days_Enrolled", "Total_Days_Unexcused_Absent"]
+
+
+def memory_report(df: pd.DataFrame) -> dict[str, int]:
+    return {col: int(n) for col, n in df.memory_usage(deep=True, index=False).items()}
+
+
+def optimize_dtypes(df: pd.DataFrame) -> dict[str, dict]:
+    """Convert repeated labels to categoricals and whole day counts to small ints, in place.
+
+    Day counts with gaps or fractional days stay float64 so derived rates are
+    unchanged. Returns a per-column report of bytes before/after and the final dtype.
+    """
+    before = memory_report(df)
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col in DAY_COUNT_COLUMNS:
+        if col not in df.columns or not pd.api.types.is_float_dtype(df[col]):
+            continue
+        values = df[col]
+        if values.notna().all() and (values % 1 == 0).all():
+            df[col] = pd.to_numeric(values.astype("int64"), downcast="integer")
+    after = memory_report(df)
+    return {
+        col: {"before": before.get(col, 0), "after": after[col], "dtype": str(df[col].dtype)}
+        for col in df.columns
+    }
@@ -0,0 +1,60 @@
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Collapse identical concurrent calls into one.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it runs wait for it and get its result, or its exception.
+    Nothing is kept once the call finishes, so this is not a cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+        self.executed = 0
+        self.shared = 0
+
+
+    def run(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'inFlight': len(self._calls), 'executed': self.executed, 'shared': self.shared}
+
+
+
+in_flight = SingleFlight()
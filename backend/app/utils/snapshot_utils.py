@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+
+import joblib
+import pandas as pd
+import pyarrow.feather as feather
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each worker builds its own copy
+    fcntl = None
+
+from backend.app.config import get_alerts_data_path, get_predictions_data_path, get_snapshot_dir
+from backend.app.utils.logger import logger
+from backend.app.utils.model_file_utils import FileUtils
+
+
+class SnapshotUtils:
+    """Processed frames and their derived state, persisted for reuse.
+
+    Frames are written as uncompressed Feather and state as uncompressed
+    joblib, so restoring memory-maps both: numeric columns without nulls and
+    the numpy arrays inside the models stay backed by the page cache, which
+    every worker process attached to the same snapshot shares.
+    """
+
+    # Bump when the layout of a persisted frame or its state changes, so
+    # snapshots written by older code are rebuilt rather than restored.
+    FORMAT = 3
+
+    def __init__(self) -> None:
+        self.SNAPSHOT_DIR = get_snapshot_dir()
+        self.enabled = bool(self.SNAPSHOT_DIR)
+        self._lock_file = None
+        if self.enabled:
+            os.makedirs(self.SNAPSHOT_DIR, exist_ok=True)
+
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.SNAPSHOT_DIR, name)
+
+
+    @staticmethod
+    def sources(name: str) -> list[str]:
+        """Files snapshot ``name`` is built from.
+
+        Predictions come from their parquet file alone. The alerts frame also
+        takes its school year from the predictions file and holds the models,
+        which its build may retrain and rewrite, so those count for it too.
+        """
+        if name == 'predictions':
+            return [get_predictions_data_path()]
+        model_dir = FileUtils().MODEL_CACHE_DIR
+        paths = [get_alerts_data_path(), get_predictions_data_path()]
+        paths += sorted(os.path.join(model_dir, name) for name in os.listdir(model_dir) if name.endswith('.joblib'))
+        return paths
+
+
+    def fingerprint(self, name: str) -> str:
+        """Hash the size and mtime of the files snapshot ``name`` is built from."""
+        digest = hashlib.sha256(f'format:{self.FORMAT};'.encode())
+        for path in self.sources(name):
+            if os.path.exists(path):
+                stat = os.stat(path)
+                digest.update(f'{path}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+            else:
+                digest.update(f'{path}:missing;'.encode())
+        return digest.hexdigest()
+
+
+    def acquire(self, name: str):
+        """Block until no other process is building snapshot ``name``.
+
+        The first worker to boot takes the lock and builds; the rest wait on it
+        and then find a fresh snapshot to attach to.
+        """
+        if not self.enabled or fcntl is None:
+            return
+        self._lock_file = open(self._path(f'{name}.lock'), 'w')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+
+
+    def release(self):
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN) #type:ignore
+            self._lock_file.close()
+            self._lock_file = None
+
+
+    def save(self, name: str, df: pd.DataFrame, state: dict | None = None):
+        if not self.enabled:
+            return
+        try:
+            frame_path, state_path, manifest_path = self._path(f'{name}.feather'), self._path(f'{name}_state.joblib'), self._path(f'{name}.json')
+
+            feather.write_feather(df, frame_path + '.tmp', compression='uncompressed')
+            joblib.dump(state or {}, state_path + '.tmp')
+            os.replace(frame_path + '.tmp', frame_path)
+            os.replace(state_path + '.tmp', state_path)
+
+            with open(manifest_path + '.tmp', 'w') as f:
+                json.dump({'fingerprint': self.fingerprint(name), 'rows': len(df)}, f)
+            os.replace(manifest_path + '.tmp', manifest_path)
+            logger.info(f'Saved {name} snapshot to {self.SNAPSHOT_DIR}')
+        except Exception as e:
+            logger.warning(f'Could not save {name} snapshot: {e}')
+
+
+    def restore(self, name: str) -> tuple[pd.DataFrame, dict] | None:
+        """Return the saved frame and state if they match the current sources.
+
+        Returns None when there is no usable snapshot.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(f'{name}.json')) as f:
+                manifest = json.load(f)
+            if manifest.get('fingerprint') != self.fingerprint(name):
+                logger.info(f'{name} snapshot is stale, rebuilding')
+                return None
+
+            state = joblib.load(self._path(f'{name}_state.joblib'), mmap_mode='r')
+            table = feather.read_table(self._path(f'{name}.feather'), memory_map=True)
+            return table.to_pandas(split_blocks=True), state
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Could not restore {name} snapshot: {e}')
+            return None
@@ -0,0 +1,63 @@
+import json
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from backend.app.utils.logger import logger
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class StageTimer:
+    """Wall time, CPU time and peak-RSS growth for each stage of a pipeline.
+
+    CPU time is process-wide, so stages that run concurrently (the model
+    trainers) each include the others' work for the time they overlap.
+    """
+
+    def __init__(self, pipeline: str):
+        self.pipeline = pipeline
+        self.stages: list[dict] = []
+        self._started = time.perf_counter()
+
+
+    @contextmanager
+    def stage(self, name: str):
+        wall, cpu, rss = time.perf_counter(), time.process_time(), _peak_rss_mb()
+        try:
+            yield
+        finally:
+            peak = _peak_rss_mb()
+            self.stages.append({
+                'stage': name,
+                'wallSeconds': round(time.perf_counter() - wall, 3),
+                'cpuSeconds': round(time.process_time() - cpu, 3),
+                'peakMemoryDeltaMb': round(peak - rss, 1) if peak is not None and rss is not None else None,
+            })
+
+
+    def timed(self, name: str, fn, *args, **kwargs):
+        with self.stage(name):
+            return fn(*args, **kwargs)
+
+
+    def report(self) -> dict:
+        return {
+            'pipeline': self.pipeline,
+            'totalSeconds': round(time.perf_counter() - self._started, 3),
+            'stages': list(self.stages),
+        }
+
+
+    def log(self) -> dict:
+        report = self.report()
+        logger.info(json.dumps({'event': 'pipeline_stages', **report}))
+        return report
@@ -0,0 +1,96 @@
+"""Cold boot versus warm boot from the processed-data snapshots.
+
+Loads the predictions and alerts data in a fresh process against one
+snapshot directory, which builds both snapshots from the parquet files.
+Then boots ``--workers`` processes at once against the same directory, as
+uvicorn workers would, and every one of them must restore both snapshots
+rather than rebuild. Run from the directory the app is served from:
+
+    python -m backend.benchmarks.warm_boot [--snapshot-dir DIR] [--workers N]
+
+Without ``--snapshot-dir`` a new temporary directory is used, so the first
+boot is always cold.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def boot() -> dict:
+    """Load both stores the way app startup does; the stages each one ran."""
+    from backend.app.data_store import data_store, prediction_store
+    from backend.app.services.predictions import load_and_process_data
+    from backend.app.utils.loader import load_and_process
+
+    started = time.perf_counter()
+    load_and_process_data()
+    load_and_process(data_store)
+    return {
+        'seconds': round(time.perf_counter() - started, 2),
+        'predictions': [stage['stage'] for stage in prediction_store.stage_timings['stages']],
+        'alerts': [stage['stage'] for stage in data_store.stage_timings['stages']],
+        'error': data_store.load_error,
+    }
+
+
+def restored(stages: list[str]) -> bool:
+    """Whether the source parquet was left unread; the predictions cube and
+    lists are rebuilt from the restored frame either way."""
+    return 'snapshot_restore' in stages and not {'read_parquet', 'load_data'} & set(stages)
+
+
+def run_boots(snapshot_dir: str, count: int) -> list[dict]:
+    """Boot ``count`` processes at once and collect what each one ran."""
+    env = dict(os.environ, DATA_SNAPSHOT_DIR=snapshot_dir)
+    processes = [
+        subprocess.Popen(
+            [sys.executable, '-m', 'backend.benchmarks.warm_boot', '--child'],
+            env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        for _ in range(count)
+    ]
+    results = []
+    for process in processes:
+        stdout, _ = process.communicate()
+        if process.returncode:
+            sys.exit(f'boot process exited with {process.returncode}')
+        results.append(json.loads(stdout.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--snapshot-dir')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(boot()))
+        return
+
+    snapshot_dir = args.snapshot_dir or tempfile.mkdtemp(prefix='data_snapshot_')
+    first, = run_boots(snapshot_dir, 1)
+    workers = run_boots(snapshot_dir, args.workers)
+
+    problems = []
+    for label, result in [('first boot', first)] + [(f'worker {i}', result) for i, result in enumerate(workers, 1)]:
+        print(f'{label:>10}: {result["seconds"]:8.2f} s  '
+              f'predictions {"restored" if restored(result["predictions"]) else "built"}, '
+              f'alerts {"restored" if restored(result["alerts"]) else "built"}')
+        if label == 'first boot':
+            continue
+        problems += [f'{label}: {name} was rebuilt: {result[name]}' for name in ('predictions', 'alerts') if not restored(result[name])]
+        if result['error']:
+            problems.append(f'{label}: alerts failed to load: {result["error"]}')
+    if problems:
+        sys.exit('warm boot did not restore from the snapshot:\n  ' + '\n  '.join(problems))
+    print(f'all {len(workers)} workers restored both snapshots')
+
+
+if __name__ == '__main__':
+    main()